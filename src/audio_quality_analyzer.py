@@ -8,7 +8,11 @@ import numpy as np
 from scipy import signal, fft
 from pydub import AudioSegment
 from typing import Dict, List, Tuple, Optional
-import warnings
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import os
+import sys
+import threading
 
 # Professional loudness metering
 try:
@@ -18,6 +22,171 @@ except ImportError:
     LUFS_AVAILABLE = False
     print("⚠ pyloudnorm not available, LUFS metering disabled")
 
+# Optional JIT compilation for the sample-level scanning loops
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional SIMD RMS kernel
+try:
+    import numpy_rms
+    NUMPY_RMS_AVAILABLE = True
+except ImportError:
+    NUMPY_RMS_AVAILABLE = False
+
+# Optional FFTW backend - plans are measured once per shape (FFTW keeps the
+# wisdom), with the effort passed per call so pyFFTW's global config is left
+# alone; scipy's pocketfft is used when pyFFTW is not installed
+try:
+    import pyfftw.interfaces.scipy_fft
+    _rfft = functools.partial(pyfftw.interfaces.scipy_fft.rfft,
+                              planner_effort='FFTW_MEASURE')
+    FFTW_AVAILABLE = True
+except ImportError:
+    _rfft = fft.rfft
+    FFTW_AVAILABLE = False
+
+# NumPy dtype for each pydub sample width (24-bit audio is widened to 32)
+_SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+# Frequency bands for balance analysis: (name, low Hz, high Hz)
+FREQUENCY_BANDS = (
+    ('sub_bass', 20, 60),
+    ('bass', 60, 250),
+    ('low_mid', 250, 500),
+    ('mid', 500, 2000),
+    ('high_mid', 2000, 6000),
+    ('high', 6000, 20000),
+)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _scan_silence(samples, hop, threshold_sq, min_gap):
+        """
+        Single pass over the samples: mean energy per hop-sized frame,
+        silent-frame run-length detection and total silent sample count.
+        Returns (start_samples, lengths) of runs longer than min_gap samples.
+        """
+        n = samples.shape[0]
+        n_frames = (n + hop - 1) // hop
+        starts = np.empty(n_frames // 2 + 1, dtype=np.int64)
+        lengths = np.empty(n_frames // 2 + 1, dtype=np.int64)
+        count = 0
+        total_silent = 0
+        run_start = -1
+        
+        for frame in range(n_frames):
+            lo = frame * hop
+            hi = min(lo + hop, n)
+            energy = 0.0
+            for i in range(lo, hi):
+                energy += samples[i] * samples[i]
+            
+            if energy / (hi - lo) < threshold_sq:
+                total_silent += hi - lo
+                if run_start < 0:
+                    run_start = lo
+            elif run_start >= 0:
+                if lo - run_start > min_gap:
+                    starts[count] = run_start
+                    lengths[count] = lo - run_start
+                    count += 1
+                run_start = -1
+        
+        # Audio ending in silence
+        if run_start >= 0 and n - run_start > min_gap:
+            starts[count] = run_start
+            lengths[count] = n - run_start
+            count += 1
+        
+        return starts[:count], lengths[:count], total_silent
+
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _level_stats(samples, clip_threshold, near_threshold):
+        """
+        Absolute peak, sum of squares and the clipped / near-clipped sample
+        counts in a single pass over the samples
+        """
+        peak = 0.0
+        sum_sq = 0.0
+        clipped = 0
+        near_clipped = 0
+        
+        for i in range(samples.shape[0]):
+            x = samples[i]
+            a = abs(x)
+            if a > peak:
+                peak = a
+            sum_sq += x * x
+            if a >= clip_threshold:
+                clipped += 1
+            if a >= near_threshold:
+                near_clipped += 1
+        
+        return peak, sum_sq, clipped, near_clipped
+
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _spectral_stats(Zxx, freqs):
+        """
+        Per-frame spectral centroid, 95% rolloff, flatness and flux computed
+        in a single pass over a (frames, bins) complex spectrum, without
+        materializing magnitude or power matrices. flux[0] is undefined.
+        """
+        n_frames, n_bins = Zxx.shape
+        centroid = np.zeros(n_frames)
+        rolloff = np.zeros(n_frames)
+        flatness = np.zeros(n_frames)
+        flux = np.zeros(n_frames)
+        
+        for t in range(n_frames):
+            total = 0.0
+            weighted = 0.0
+            log_sum = 0.0
+            diff_sq = 0.0
+            for k in range(n_bins):
+                z = Zxx[t, k]
+                p = z.real * z.real + z.imag * z.imag
+                total += p
+                weighted += freqs[k] * p
+                log_sum += np.log(p + 1e-10)
+                if t > 0:
+                    prev = Zxx[t - 1, k]
+                    d = np.sqrt(p) - np.sqrt(prev.real * prev.real + prev.imag * prev.imag)
+                    diff_sq += d * d
+            
+            centroid[t] = weighted / (total + 1e-10)
+            flatness[t] = np.exp(log_sum / n_bins) / (total / n_bins + 1e-10)
+            flux[t] = np.sqrt(diff_sq / n_bins)
+            
+            # Rolloff needs the frame total first; rescan up to the crossing
+            threshold = 0.95 * total
+            running = 0.0
+            for k in range(n_bins):
+                z = Zxx[t, k]
+                running += z.real * z.real + z.imag * z.imag
+                if running >= threshold:
+                    rolloff[t] = freqs[k]
+                    break
+        
+        return centroid, rolloff, flatness, flux
+
+# Horizontal rule used by the printed report
+_RULE = "=" * 70
+
+
+def _peak(samples: np.ndarray) -> float:
+    """Absolute peak without materializing an np.abs() copy of the buffer"""
+    return float(max(np.max(samples), -np.min(samples)))
+
+
+def _rms(samples: np.ndarray) -> float:
+    """RMS level without materializing a squared copy of the buffer"""
+    if NUMPY_RMS_AVAILABLE and samples.dtype == np.float32 and samples.flags.c_contiguous:
+        return float(numpy_rms.rms(samples)[0])
+    return float(np.sqrt(np.einsum('i,i->', samples, samples, dtype=np.float64) / samples.size))
+
 
 class AudioQualityReport:
     """Comprehensive audio quality report"""
@@ -68,33 +237,43 @@ class AudioQualityReport:
         self.warnings: List[str] = []
         self.passed: bool = False
     
+    # to_dict layout: (key, attribute, decimals) for the rounded metrics
+    # before and after the frequency balance block, and the balance bands
+    _FIELDS = (
+        ('peak_level_db', 'peak_level_db', 2),
+        ('rms_level_db', 'rms_level_db', 2),
+        ('dynamic_range_db', 'dynamic_range_db', 2),
+        ('crest_factor_db', 'crest_factor_db', 2),
+        ('clipping_percentage', 'clipping_percentage', 3),
+        ('silence_gaps', 'silence_gap_count', 0),
+        ('total_silence_percentage', 'total_silence_percentage', 2),
+        ('longest_silence_duration', 'longest_silence_duration', 2),
+        ('spectral_centroid', 'spectral_centroid', 1),
+    )
+    _BALANCE_FIELDS = (
+        ('sub_bass', 'sub_bass_energy'),
+        ('bass', 'bass_energy'),
+        ('low_mid', 'low_mid_energy'),
+        ('mid', 'mid_energy'),
+        ('high_mid', 'high_mid_energy'),
+        ('high', 'high_energy'),
+    )
+    _SCORE_FIELDS = (
+        ('stereo_width', 'stereo_width', 2),
+        ('phase_correlation', 'phase_correlation', 2),
+        ('overall_score', 'overall_score', 1),
+    )
+    
     def to_dict(self) -> Dict:
         """Convert report to dictionary"""
-        return {
-            'peak_level_db': round(self.peak_level_db, 2),
-            'rms_level_db': round(self.rms_level_db, 2),
-            'dynamic_range_db': round(self.dynamic_range_db, 2),
-            'crest_factor_db': round(self.crest_factor_db, 2),
-            'clipping_percentage': round(self.clipping_percentage, 3),
-            'silence_gaps': len(self.silence_gaps),
-            'total_silence_percentage': round(self.total_silence_percentage, 2),
-            'longest_silence_duration': round(self.longest_silence_duration, 2),
-            'spectral_centroid': round(self.spectral_centroid, 1),
-            'frequency_balance': {
-                'sub_bass': round(self.sub_bass_energy, 2),
-                'bass': round(self.bass_energy, 2),
-                'low_mid': round(self.low_mid_energy, 2),
-                'mid': round(self.mid_energy, 2),
-                'high_mid': round(self.high_mid_energy, 2),
-                'high': round(self.high_energy, 2),
-            },
-            'stereo_width': round(self.stereo_width, 2),
-            'phase_correlation': round(self.phase_correlation, 2),
-            'overall_score': round(self.overall_score, 1),
-            'passed': self.passed,
-            'issues': self.issues,
-            'warnings': self.warnings,
-        }
+        d = {key: round(getattr(self, attr), n) for key, attr, n in self._FIELDS}
+        d['frequency_balance'] = {key: round(getattr(self, attr), 2)
+                                  for key, attr in self._BALANCE_FIELDS}
+        d.update((key, round(getattr(self, attr), n)) for key, attr, n in self._SCORE_FIELDS)
+        d['passed'] = self.passed
+        d['issues'] = self.issues
+        d['warnings'] = self.warnings
+        return d
 
 
 class AudioQualityAnalyzer:
@@ -103,6 +282,9 @@ class AudioQualityAnalyzer:
     Detects issues: clipping, silence gaps, poor frequency balance, phase problems
     """
     
+    # Threads analyze() uses for its concurrent stages
+    _STAGE_WORKERS = 4
+    
     def __init__(self, sample_rate: int = 96000):
         self.sample_rate = sample_rate
         
@@ -120,6 +302,42 @@ class AudioQualityAnalyzer:
             'stereo_width_min': 10.0,         # RELAXED: 10% minimum stereo
             'frequency_balance_tolerance': 8.0, # RELAXED: ±8dB balance OK
         }
+        
+        # Spectral and band stages run on a decimated mono copy. The integer
+        # factor keeps 20 kHz (top of the "high" band) below Nyquist, so
+        # 88.2/96 kHz are halved and 44.1/48 kHz run as-is
+        self._decimation = max(1, sample_rate // 40000)
+        self._analysis_rate = sample_rate / self._decimation
+        self._decimation_fir = None
+        if self._decimation > 1:
+            self._decimation_fir = signal.firwin(
+                20 * self._decimation + 1, 1 / self._decimation,
+                window=('kaiser', 5.0)).astype(np.float32)
+        
+        # STFT window (periodic Hann, scaled like scipy.signal.stft) and bins
+        window = signal.windows.hann(4096, sym=False)
+        self._stft_window = (window / window.sum()).astype(np.float32)
+        self._stft_freqs = fft.rfftfreq(4096, 1 / self._analysis_rate)
+        
+        # Frequency balance FFT: Hann window, bin frequencies and, since the
+        # bins are sorted, each band as a contiguous slice of bins. Bands
+        # above Nyquist come out as empty slices and sum to zero
+        self._balance_fft_size = fft.next_fast_len(8192, real=True)
+        self._balance_window = signal.windows.hann(self._balance_fft_size).astype(np.float32)
+        self._balance_freqs = fft.rfftfreq(self._balance_fft_size, 1 / self._analysis_rate)
+        self._band_slices = [
+            slice(int(np.searchsorted(self._balance_freqs, low)),
+                  int(np.searchsorted(self._balance_freqs, high)))
+            for _, low, high in FREQUENCY_BANDS
+        ]
+        
+        # 4x oversampling FIR for true-peak detection (ITU-R BS.1770)
+        self._true_peak_fir = signal.firwin(81, 1 / 4, window=('kaiser', 8.6)).astype(np.float32)
+        
+        # Loudness meters, keyed by sample rate, per thread: integrated_loudness
+        # stores its block loudness on the meter, so analyze_batch threads
+        # must not share one
+        self._meters = threading.local()
     
     def analyze(self, audio: AudioSegment, verbose: bool = True) -> AudioQualityReport:
         """
@@ -134,43 +352,66 @@ class AudioQualityAnalyzer:
         """
         report = AudioQualityReport()
         
-        # Convert to numpy array
-        samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
-        samples = samples / (2**15)  # Normalize to -1.0 to 1.0
+        # Convert to numpy array: zero-copy view of pydub's buffer, normalized
+        # to -1.0..1.0 for the actual sample width in a single float32 pass
+        raw = np.frombuffer(audio.raw_data, dtype=_SAMPLE_DTYPES[audio.sample_width])
+        scale = np.float32(1.0 / (1 << (8 * audio.sample_width - 1)))
+        samples = np.multiply(raw, scale, dtype=np.float32)
         
         # Handle stereo
         if audio.channels == 2:
             samples = samples.reshape(-1, 2)
             left = samples[:, 0]
             right = samples[:, 1]
-            mono = (left + right) / 2.0
+            # Halve in place: one mono allocation instead of two
+            mono = np.add(left, right)
+            mono *= 0.5
         else:
+            # Mono fast path: the buffer already is the mono signal - no
+            # channel split, and the 1D buffer goes straight to the meter
             mono = samples
-            left = right = mono
+            left = right = None
         
-        # 1. Peak & RMS Analysis
-        self._analyze_levels(mono, report)
-        
-        # 2. Clipping & Saturation Detection
-        self._analyze_clipping(mono, report)
+        # 1-2. Peak & RMS Analysis, Clipping & Saturation Detection (16-bit
+        # mono hands over its raw buffer too - that buffer is the mono mix)
+        raw_mono = raw if audio.channels == 1 and raw.dtype == np.int16 else None
+        self._analyze_levels_and_clipping(mono, report, raw_mono)
         
         # 3. Silence Gap Detection
         self._analyze_silence_gaps(mono, report, audio.duration_seconds)
         
-        # 4. Professional LUFS Metering
-        if LUFS_AVAILABLE:
-            self._analyze_lufs(samples if audio.channels == 2 else mono.reshape(-1, 1), 
-                              report, audio.frame_rate)
-        
-        # 5. Spectral Analysis
-        self._analyze_spectrum(mono, report)
-        
-        # 5. Frequency Balance Analysis
-        self._analyze_frequency_balance(mono, report)
-        
-        # 6. Stereo Analysis
-        if audio.channels == 2:
-            self._analyze_stereo(left, right, report)
+        # 4-6. LUFS, spectral, frequency balance and stereo stages only read
+        # the sample buffers and write disjoint report fields, so run them
+        # concurrently (NumPy/SciPy release the GIL inside their kernels)
+        with ThreadPoolExecutor(max_workers=self._STAGE_WORKERS) as executor:
+            futures = []
+            
+            # 4. Professional LUFS Metering
+            if LUFS_AVAILABLE:
+                futures.append(executor.submit(
+                    self._analyze_lufs, samples, report, audio.frame_rate))
+            
+            # 6. Stereo Analysis
+            if left is not None:
+                futures.append(executor.submit(self._analyze_stereo, left, right, report))
+            
+            # Decimated mono for the spectral and band stages, built while
+            # LUFS runs (LUFS and true peak stay at the native rate per BS.1770)
+            if self._decimation > 1:
+                mono_lo = signal.resample_poly(mono, 1, self._decimation,
+                                               window=self._decimation_fir)
+            else:
+                mono_lo = mono
+            
+            # 5. Spectral Analysis
+            futures.append(executor.submit(self._analyze_spectrum, mono_lo, report))
+            
+            # 5. Frequency Balance Analysis
+            futures.append(executor.submit(self._analyze_frequency_balance, mono_lo, report))
+            
+            # Propagate any stage exception
+            for future in futures:
+                future.result()
         
         # 7. Calculate Overall Score
         self._calculate_score(report)
@@ -183,14 +424,76 @@ class AudioQualityAnalyzer:
         
         return report
     
-    def _analyze_levels(self, samples: np.ndarray, report: AudioQualityReport):
-        """Analyze peak and RMS levels"""
-        # Peak level
-        peak = np.max(np.abs(samples))
-        report.peak_level_db = 20 * np.log10(peak + 1e-10)
+    def analyze_batch(self, audios: List[AudioSegment],
+                      max_workers: Optional[int] = None) -> List[AudioQualityReport]:
+        """
+        Analyze several tracks concurrently
         
-        # RMS level
-        rms = np.sqrt(np.mean(samples**2))
+        Runs silently (verbose=False) so reports from different tracks do not
+        interleave on stdout; print them afterwards if needed.
+        
+        Args:
+            audios: AudioSegments to analyze
+            max_workers: Tracks analyzed at once (default: enough that, with
+                         each track's stage threads, the CPUs are not
+                         oversubscribed)
+        
+        Returns:
+            AudioQualityReports in the same order as audios
+        """
+        # Every per-track buffer is local to analyze() and the heavy kernels
+        # (NumPy, SciPy, Numba nogil) release the GIL, so threads scale.
+        # Each analyze() runs its own stage pool, so the default divides the
+        # CPUs by its size rather than starting cpu_count x 4 threads
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 1) // self._STAGE_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda audio: self.analyze(audio, verbose=False), audios))
+    
+    def _analyze_levels_and_clipping(self, mono: np.ndarray, report: AudioQualityReport,
+                                     raw_mono: Optional[np.ndarray] = None):
+        """
+        Analyze peak and RMS levels, detect clipping and saturation
+        
+        Everything is measured on the mono mix. raw_mono, when given, is the
+        same mix as int16 samples; without Numba, peak and clip counts are
+        then taken from it with integer thresholds (half the bytes of the
+        float32 buffer, same results since int16 / 32768 is exact)
+        """
+        # Hard clipping (samples at exactly ±1.0) and near-clipping (> 0.95)
+        clipping_threshold = 0.99
+        near_clipping_threshold = 0.95
+        
+        if NUMBA_AVAILABLE:
+            # Peak, sum of squares and both clip counts in one fused pass
+            peak, sum_sq, clipped_samples, near_clipped = _level_stats(
+                mono, clipping_threshold, near_clipping_threshold)
+            rms = float(np.sqrt(sum_sq / mono.size))
+        elif raw_mono is not None:
+            # Smallest int16 values whose float32 scaling reaches each threshold
+            clip_i16 = int(np.ceil(clipping_threshold * 32768))
+            near_i16 = int(np.ceil(near_clipping_threshold * 32768))
+            
+            # Widen before negating: -(-32768) does not fit in int16
+            peak = max(int(np.max(raw_mono)), -int(np.min(raw_mono))) / 32768.0
+            rms = _rms(mono)
+            
+            clipped_samples = (np.count_nonzero(raw_mono >= clip_i16) +
+                               np.count_nonzero(raw_mono <= -clip_i16))
+            near_clipped = (np.count_nonzero(raw_mono >= near_i16) +
+                            np.count_nonzero(raw_mono <= -near_i16))
+        else:
+            peak = _peak(mono)
+            rms = _rms(mono)
+            
+            # Test both polarities instead of materializing np.abs
+            clipped_samples = (np.count_nonzero(mono >= clipping_threshold) +
+                               np.count_nonzero(mono <= -clipping_threshold))
+            near_clipped = (np.count_nonzero(mono >= near_clipping_threshold) +
+                            np.count_nonzero(mono <= -near_clipping_threshold))
+        
+        # Peak and RMS levels
+        report.peak_level_db = 20 * np.log10(peak + 1e-10)
         report.rms_level_db = 20 * np.log10(rms + 1e-10)
         
         # Dynamic range (rough estimate)
@@ -198,45 +501,54 @@ class AudioQualityAnalyzer:
         
         # Crest factor
         report.crest_factor_db = 20 * np.log10(peak / (rms + 1e-10))
-    
-    def _analyze_clipping(self, samples: np.ndarray, report: AudioQualityReport):
-        """Detect clipping and saturation"""
-        # Hard clipping (samples at exactly ±1.0)
-        clipping_threshold = 0.99
-        clipped_samples = np.sum(np.abs(samples) >= clipping_threshold)
-        report.clipping_percentage = (clipped_samples / len(samples)) * 100.0
-        report.saturation_count = clipped_samples
         
-        # Near-clipping (samples > 0.95)
-        near_clipping_threshold = 0.95
-        near_clipped = np.sum(np.abs(samples) >= near_clipping_threshold)
-        report.near_clipping_percentage = (near_clipped / len(samples)) * 100.0
+        # Clipping statistics
+        report.clipping_percentage = (clipped_samples / len(mono)) * 100.0
+        report.saturation_count = int(clipped_samples)
+        report.near_clipping_percentage = (near_clipped / len(mono)) * 100.0
+    
+    def _loudness_meter(self, sample_rate: int) -> 'pyln.Meter':
+        """BS.1770 meter for sample_rate, cached across this thread's analyses"""
+        meters: Optional[Dict[int, 'pyln.Meter']] = getattr(self._meters, 'by_rate', None)
+        if meters is None:
+            meters = self._meters.by_rate = {}
+        meter = meters.get(sample_rate)
+        if meter is None:
+            meter = meters[sample_rate] = pyln.Meter(sample_rate)
+        return meter
     
     def _analyze_lufs(self, samples: np.ndarray, report: AudioQualityReport, sample_rate: int):
         """
         Measure professional loudness standards (ITU-R BS.1770)
         """
+        # Digital silence has no loudness - skip the K-filter and
+        # oversampling entirely
+        if not np.any(samples):
+            report.integrated_lufs = -np.inf
+            report.true_peak_db = -np.inf
+            return
+        
+        # BS.1770 gating needs at least one 400ms block - shorter clips get
+        # the same fallback as a failed measurement
+        if samples.shape[0] < int(0.4 * sample_rate):
+            report.integrated_lufs = -14.0  # Default fallback
+            report.true_peak_db = -1.0
+            return
+        
         try:
-            # Create loudness meter
-            meter = pyln.Meter(sample_rate)
+            # Loudness meter (K-weighting filters are designed once per rate)
+            meter = self._loudness_meter(sample_rate)
             
-            # Integrated loudness (overall loudness)
+            # Integrated loudness (overall loudness, accepts 1D mono directly)
             report.integrated_lufs = meter.integrated_loudness(samples)
             
-            # True peak (inter-sample peaks using oversampling)
-            if samples.ndim == 1:
-                samples_2d = samples.reshape(-1, 1)
-            else:
-                samples_2d = samples
-            
-            # Calculate true peak for each channel
-            true_peaks = []
-            for channel in range(samples_2d.shape[1]):
-                channel_data = samples_2d[:, channel]
-                # Upsample 4x for true peak detection
-                upsampled = signal.resample(channel_data, len(channel_data) * 4)
-                peak = np.max(np.abs(upsampled))
-                true_peaks.append(20 * np.log10(peak) if peak > 0 else -np.inf)
+            # True peak (inter-sample peaks using 4x polyphase oversampling,
+            # all channels in one call)
+            upsampled = signal.resample_poly(samples, 4, 1, axis=0,
+                                             window=self._true_peak_fir)
+            peaks = np.maximum(np.max(upsampled, axis=0), -np.min(upsampled, axis=0))
+            true_peaks = [20 * np.log10(peak) if peak > 0 else -np.inf
+                          for peak in np.atleast_1d(peaks)]
             
             report.true_peak_db = max(true_peaks)
             
@@ -251,156 +563,164 @@ class AudioQualityAnalyzer:
         # Silence threshold (in linear amplitude)
         silence_threshold = 0.001  # -60dB
         
-        # Detect silence regions
-        is_silent = np.abs(samples) < silence_threshold
-        
-        # Find contiguous silent regions
-        silent_regions = []
-        in_silence = False
-        silence_start = 0
-        
-        for i, silent in enumerate(is_silent):
-            if silent and not in_silence:
-                # Start of silence
-                in_silence = True
-                silence_start = i
-            elif not silent and in_silence:
-                # End of silence
-                in_silence = False
-                silence_duration = (i - silence_start) / self.sample_rate
-                
-                # Only record gaps > 0.5 seconds
-                if silence_duration > 0.5:
-                    silence_start_time = silence_start / self.sample_rate
-                    silent_regions.append((silence_start_time, silence_duration))
-        
-        # Handle case where audio ends in silence
-        if in_silence:
-            silence_duration = (len(samples) - silence_start) / self.sample_rate
-            if silence_duration > 0.5:
-                silence_start_time = silence_start / self.sample_rate
-                silent_regions.append((silence_start_time, silence_duration))
+        # Work on 10ms RMS frames - gaps only matter above 0.5s, so
+        # per-sample resolution is wasted effort
+        hop = max(1, int(0.01 * self.sample_rate))
+        min_gap = 0.5 * self.sample_rate  # Only record gaps > 0.5 seconds
+        
+        if NUMBA_AVAILABLE:
+            # Fused threshold + run-length pass, no intermediate arrays
+            gap_starts, gap_lengths, total_silent_samples = _scan_silence(
+                samples, hop, silence_threshold**2, min_gap)
+        else:
+            frame_starts = np.arange(0, len(samples), hop)
+            frame_lengths = np.diff(np.append(frame_starts, len(samples)))
+            frame_energy = np.add.reduceat(samples * samples, frame_starts) / frame_lengths
+            is_silent = frame_energy < silence_threshold**2
+            
+            # Find contiguous silent regions via edge detection
+            edges = np.diff(np.concatenate(([0], is_silent.astype(np.int8), [0])))
+            starts = np.flatnonzero(edges == 1)
+            ends = np.flatnonzero(edges == -1)
+            
+            # Convert frame indices back to sample positions
+            start_samples = frame_starts[starts]
+            lengths = np.append(frame_starts, len(samples))[ends] - start_samples
+            
+            long_gaps = lengths > min_gap
+            gap_starts = start_samples[long_gaps]
+            gap_lengths = lengths[long_gaps]
+            total_silent_samples = np.sum(frame_lengths[is_silent])
+        
+        durations = gap_lengths / self.sample_rate
+        silent_regions = list(zip((gap_starts / self.sample_rate).tolist(),
+                                  durations.tolist()))
         
         report.silence_gaps = silent_regions
         report.silence_gap_count = len(silent_regions)
         
         # Calculate total silence
-        total_silent_samples = np.sum(is_silent)
         report.total_silence_percentage = (total_silent_samples / len(samples)) * 100.0
         
         # Longest silence
-        if silent_regions:
-            report.longest_silence_duration = max(dur for _, dur in silent_regions)
-        else:
-            report.longest_silence_duration = 0.0
+        report.longest_silence_duration = float(durations.max()) if len(durations) else 0.0
     
     def _analyze_spectrum(self, samples: np.ndarray, report: AudioQualityReport):
         """Spectral analysis using FFT"""
-        # Use STFT for time-varying analysis
+        # Manual STFT: half-overlapping frames straight into a real FFT.
+        # No boundary padding, and float32 frames give complex64 spectra
         nperseg = 4096
-        noverlap = nperseg // 2
-        
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            f, t, Zxx = signal.stft(samples, fs=self.sample_rate, 
-                                   nperseg=nperseg, noverlap=noverlap)
-        
-        magnitude = np.abs(Zxx)
-        power = magnitude**2
+        hop = nperseg // 2
+        
+        # Keep the whole pipeline single precision (complex64 spectra)
+        samples = samples.astype(np.float32, copy=False)
+        if len(samples) < nperseg:
+            samples = np.pad(samples, (0, nperseg - len(samples)))
+        
+        frames = np.lib.stride_tricks.sliding_window_view(samples, nperseg)[::hop]
+        # pyFFTW may hand back complex128; cast so the spectral kernel sees
+        # one dtype either way (a no-op when it already matches)
+        Zxx = _rfft(frames * self._stft_window, axis=1, workers=-1)
+        Zxx = Zxx.astype(np.complex64, copy=False)
+        f = self._stft_freqs
+        
+        # Rows are time frames, columns are frequency bins
+        if NUMBA_AVAILABLE:
+            # All four metrics in one streaming pass over the spectrum
+            centroid, rolloff, flatness, flux = _spectral_stats(Zxx, f)
+            report.spectral_centroid = np.mean(centroid)
+            report.spectral_rolloff = np.mean(rolloff)
+            report.spectral_flatness = np.mean(flatness)
+            report.spectral_flux = np.mean(flux[1:]) if len(flux) > 1 else 0.0
+            return
+        
+        # |z|^2 straight from the components (no sqrt/square round trip)
+        power = Zxx.real * Zxx.real + Zxx.imag * Zxx.imag
         
         # Spectral Centroid (brightness)
-        spectral_centroid = np.sum(f[:, np.newaxis] * power, axis=0) / (np.sum(power, axis=0) + 1e-10)
+        total_power = np.sum(power, axis=1)
+        spectral_centroid = (power @ f) / (total_power + 1e-10)
         report.spectral_centroid = np.mean(spectral_centroid)
         
+        # One scratch buffer serves the cumulative and log spectra in turn
+        scratch = np.empty_like(power)
+        
         # Spectral Rolloff (95% of energy)
-        cumulative_power = np.cumsum(power, axis=0)
-        total_power = np.sum(power, axis=0)
+        cumulative_power = np.cumsum(power, axis=1, out=scratch)
         rolloff_threshold = 0.95 * total_power
-        rolloff_indices = np.argmax(cumulative_power >= rolloff_threshold, axis=0)
+        rolloff_indices = np.argmax(cumulative_power >= rolloff_threshold[:, np.newaxis], axis=1)
         report.spectral_rolloff = np.mean(f[rolloff_indices])
         
         # Spectral Flatness (noisiness vs tonality)
-        geometric_mean = np.exp(np.mean(np.log(power + 1e-10), axis=0))
-        arithmetic_mean = np.mean(power, axis=0)
+        log_power = np.log(np.add(power, 1e-10, out=scratch), out=scratch)
+        geometric_mean = np.exp(np.mean(log_power, axis=1))
+        arithmetic_mean = np.mean(power, axis=1)
         spectral_flatness = geometric_mean / (arithmetic_mean + 1e-10)
         report.spectral_flatness = np.mean(spectral_flatness)
         
-        # Spectral Flux (rate of change)
-        spectral_flux = np.sqrt(np.mean(np.diff(magnitude, axis=1)**2, axis=0))
-        report.spectral_flux = np.mean(spectral_flux)
+        # Spectral Flux (rate of change, on magnitudes). Power is not needed
+        # past this point, so take the square root in place
+        magnitude = np.sqrt(power, out=power)
+        spectral_flux = np.sqrt(np.mean(np.diff(magnitude, axis=0)**2, axis=1))
+        report.spectral_flux = np.mean(spectral_flux) if len(spectral_flux) else 0.0
     
     def _analyze_frequency_balance(self, samples: np.ndarray, report: AudioQualityReport):
         """Analyze energy distribution across frequency bands"""
-        # Compute FFT
-        fft_size = 8192
-        window = signal.windows.hann(fft_size)
+        # Compute FFT (real-input, window precomputed in __init__)
+        fft_size = self._balance_fft_size
+        window = self._balance_window
         
-        # Use multiple windows for averaging
+        # Use multiple windows for averaging (75% overlap), in float32
         hop_size = fft_size // 4
-        num_windows = (len(samples) - fft_size) // hop_size
-        
-        band_energies = {
-            'sub_bass': 0.0,
-            'bass': 0.0,
-            'low_mid': 0.0,
-            'mid': 0.0,
-            'high_mid': 0.0,
-            'high': 0.0,
-        }
-        
-        for i in range(num_windows):
-            start = i * hop_size
-            end = start + fft_size
-            
-            if end > len(samples):
-                break
-            
-            windowed = samples[start:end] * window
-            spectrum = np.abs(fft.fft(windowed))[:fft_size//2]
-            power = spectrum**2
-            
-            # Frequency bins
-            freqs = fft.fftfreq(fft_size, 1/self.sample_rate)[:fft_size//2]
-            
-            # Define frequency bands
-            band_energies['sub_bass'] += np.sum(power[(freqs >= 20) & (freqs < 60)])
-            band_energies['bass'] += np.sum(power[(freqs >= 60) & (freqs < 250)])
-            band_energies['low_mid'] += np.sum(power[(freqs >= 250) & (freqs < 500)])
-            band_energies['mid'] += np.sum(power[(freqs >= 500) & (freqs < 2000)])
-            band_energies['high_mid'] += np.sum(power[(freqs >= 2000) & (freqs < 6000)])
-            band_energies['high'] += np.sum(power[(freqs >= 6000) & (freqs < 20000)])
-        
-        # Normalize by number of windows
-        total_energy = sum(band_energies.values())
+        samples = samples.astype(np.float32, copy=False)
+        if len(samples) < fft_size:
+            return
+        frames = np.lib.stride_tricks.sliding_window_view(samples, fft_size)[::hop_size]
+        
+        # Batched real FFTs, summing power per bin - a Welch estimate without
+        # the per-frame averaging, which cancels out in the band shares.
+        # signal.welch gives the same shares but windows every frame at once
+        # on a single-threaded FFT (~3x slower here); frames are processed in
+        # blocks instead so the windowed copy stays bounded on long tracks
+        power_per_bin = np.zeros(fft_size // 2 + 1, dtype=np.float64)
+        block = 256
+        for start in range(0, len(frames), block):
+            spectrum = _rfft(frames[start:start + block] * window, axis=1, workers=-1)
+            power_per_bin += np.sum(spectrum.real**2 + spectrum.imag**2, axis=0)
+        
+        # Band energies as contiguous slice sums (sequential reads, no masks)
+        band_energies = np.array([power_per_bin[band].sum() for band in self._band_slices])
+        
+        # Normalize by total energy
+        total_energy = band_energies.sum()
         
         if total_energy > 0:
-            report.sub_bass_energy = (band_energies['sub_bass'] / total_energy) * 100.0
-            report.bass_energy = (band_energies['bass'] / total_energy) * 100.0
-            report.low_mid_energy = (band_energies['low_mid'] / total_energy) * 100.0
-            report.mid_energy = (band_energies['mid'] / total_energy) * 100.0
-            report.high_mid_energy = (band_energies['high_mid'] / total_energy) * 100.0
-            report.high_energy = (band_energies['high'] / total_energy) * 100.0
+            (report.sub_bass_energy, report.bass_energy, report.low_mid_energy,
+             report.mid_energy, report.high_mid_energy,
+             report.high_energy) = (band_energies * (100.0 / total_energy)).tolist()
     
     def _analyze_stereo(self, left: np.ndarray, right: np.ndarray, 
                        report: AudioQualityReport):
         """Analyze stereo field"""
-        # Stereo width (difference between L and R)
-        mid = (left + right) / 2.0
-        side = (left - right) / 2.0
+        # Three dot products read each channel once; the mid/side energies
+        # follow algebraically, so no mid/side arrays are materialized
+        ll = float(np.dot(left, left))
+        rr = float(np.dot(right, right))
+        lr = float(np.dot(left, right))
         
-        mid_energy = np.sum(mid**2)
-        side_energy = np.sum(side**2)
+        # Stereo width (difference between L and R)
+        mid_energy = 0.25 * (ll + 2.0 * lr + rr)
+        side_energy = 0.25 * (ll - 2.0 * lr + rr)
         
         total_energy = mid_energy + side_energy
         if total_energy > 0:
             report.stereo_width = (side_energy / total_energy) * 100.0
         
         # Phase correlation
-        numerator = np.sum(left * right)
-        denominator = np.sqrt(np.sum(left**2) * np.sum(right**2))
+        denominator = np.sqrt(ll * rr)
         
         if denominator > 0:
-            report.phase_correlation = numerator / denominator
+            report.phase_correlation = lr / denominator
     
     def _calculate_score(self, report: AudioQualityReport):
         """Calculate overall quality score (0-100) - RELAXED FOR ELECTRONIC MUSIC"""
@@ -515,56 +835,64 @@ class AudioQualityAnalyzer:
     
     def _print_report(self, report: AudioQualityReport):
         """Print formatted analysis report"""
-        print("\n" + "="*70)
-        print("🔍 AUDIO QUALITY ANALYSIS REPORT")
-        print("="*70)
-        
-        print(f"\n📊 LEVELS:")
-        print(f"  Peak:          {report.peak_level_db:>7.2f} dB")
-        print(f"  RMS:           {report.rms_level_db:>7.2f} dB")
-        print(f"  Dynamic Range: {report.dynamic_range_db:>7.2f} dB")
-        print(f"  Crest Factor:  {report.crest_factor_db:>7.2f} dB")
-        
-        print(f"\n🔊 CLIPPING & SATURATION:")
-        print(f"  Clipping:      {report.clipping_percentage:>7.3f} %")
-        print(f"  Near-Clipping: {report.near_clipping_percentage:>7.3f} %")
-        
-        print(f"\n🤫 SILENCE ANALYSIS:")
-        print(f"  Total Silence: {report.total_silence_percentage:>7.2f} %")
-        print(f"  Silence Gaps:  {report.silence_gap_count:>7} gaps")
-        print(f"  Longest Gap:   {report.longest_silence_duration:>7.2f} s")
-        
-        print(f"\n🎵 SPECTRAL ANALYSIS:")
-        print(f"  Centroid:      {report.spectral_centroid:>7.1f} Hz")
-        print(f"  Rolloff:       {report.spectral_rolloff:>7.1f} Hz")
-        print(f"  Flatness:      {report.spectral_flatness:>7.3f}")
-        print(f"  Flux:          {report.spectral_flux:>7.3f}")
-        
-        print(f"\n🎚️  FREQUENCY BALANCE:")
-        print(f"  Sub-Bass:      {report.sub_bass_energy:>7.2f} %")
-        print(f"  Bass:          {report.bass_energy:>7.2f} %")
-        print(f"  Low-Mid:       {report.low_mid_energy:>7.2f} %")
-        print(f"  Mid:           {report.mid_energy:>7.2f} %")
-        print(f"  High-Mid:      {report.high_mid_energy:>7.2f} %")
-        print(f"  High:          {report.high_energy:>7.2f} %")
-        
-        print(f"\n🎧 STEREO FIELD:")
-        print(f"  Width:         {report.stereo_width:>7.2f} %")
-        print(f"  Phase Corr:    {report.phase_correlation:>7.2f}")
-        
-        print(f"\n{'='*70}")
+        lines = [
+            "",
+            _RULE,
+            "🔍 AUDIO QUALITY ANALYSIS REPORT",
+            _RULE,
+            "",
+            "📊 LEVELS:",
+            f"  Peak:          {report.peak_level_db:>7.2f} dB",
+            f"  RMS:           {report.rms_level_db:>7.2f} dB",
+            f"  Dynamic Range: {report.dynamic_range_db:>7.2f} dB",
+            f"  Crest Factor:  {report.crest_factor_db:>7.2f} dB",
+            "",
+            "🔊 CLIPPING & SATURATION:",
+            f"  Clipping:      {report.clipping_percentage:>7.3f} %",
+            f"  Near-Clipping: {report.near_clipping_percentage:>7.3f} %",
+            "",
+            "🤫 SILENCE ANALYSIS:",
+            f"  Total Silence: {report.total_silence_percentage:>7.2f} %",
+            f"  Silence Gaps:  {report.silence_gap_count:>7} gaps",
+            f"  Longest Gap:   {report.longest_silence_duration:>7.2f} s",
+            "",
+            "🎵 SPECTRAL ANALYSIS:",
+            f"  Centroid:      {report.spectral_centroid:>7.1f} Hz",
+            f"  Rolloff:       {report.spectral_rolloff:>7.1f} Hz",
+            f"  Flatness:      {report.spectral_flatness:>7.3f}",
+            f"  Flux:          {report.spectral_flux:>7.3f}",
+            "",
+            "🎚️  FREQUENCY BALANCE:",
+            f"  Sub-Bass:      {report.sub_bass_energy:>7.2f} %",
+            f"  Bass:          {report.bass_energy:>7.2f} %",
+            f"  Low-Mid:       {report.low_mid_energy:>7.2f} %",
+            f"  Mid:           {report.mid_energy:>7.2f} %",
+            f"  High-Mid:      {report.high_mid_energy:>7.2f} %",
+            f"  High:          {report.high_energy:>7.2f} %",
+            "",
+            "🎧 STEREO FIELD:",
+            f"  Width:         {report.stereo_width:>7.2f} %",
+            f"  Phase Corr:    {report.phase_correlation:>7.2f}",
+            "",
+            _RULE,
+        ]
         
         if report.issues:
-            print("\n🚨 CRITICAL ISSUES:")
-            for issue in report.issues:
-                print(f"  {issue}")
+            lines.extend(["", "🚨 CRITICAL ISSUES:"])
+            lines.extend(f"  {issue}" for issue in report.issues)
         
         if report.warnings:
-            print("\n⚠️  WARNINGS:")
-            for warning in report.warnings:
-                print(f"  {warning}")
+            lines.extend(["", "⚠️  WARNINGS:"])
+            lines.extend(f"  {warning}" for warning in report.warnings)
         
-        print(f"\n{'='*70}")
         status = "✅ PASSED" if report.passed else "❌ FAILED"
-        print(f"OVERALL SCORE: {report.overall_score:.1f}/100 - {status}")
-        print(f"{'='*70}\n")
+        lines.extend([
+            "",
+            _RULE,
+            f"OVERALL SCORE: {report.overall_score:.1f}/100 - {status}",
+            _RULE,
+            "",
+        ])
+        
+        # Emit the whole report with a single write
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -3,18 +3,108 @@ Beat Maker - Create drum patterns and beats
 """
 
 from pydub import AudioSegment
+from pydub.utils import get_encoder_name
 from src.sounds import SoundGenerator
-from typing import List, Dict
+from typing import List, Dict, Tuple, Optional
+from math import gcd
+from concurrent.futures import ThreadPoolExecutor
+import subprocess
+import threading
+import wave
+import numpy as np
+from scipy import signal
+
+# JIT-compiled event mixing
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _scatter_add(mix, positions, sounds_flat, offsets, lengths, gains):
+        """
+        Add sounds_flat[offsets[i]:offsets[i] + lengths[i]] * gains[i] into
+        mix at positions[i] for every event, cutting sounds at the end of mix
+        """
+        n = mix.shape[0]
+        for i in range(positions.shape[0]):
+            p = positions[i]
+            off = offsets[i]
+            gain = gains[i]
+            length = min(lengths[i], n - p)
+            # Slice views give LLVM a plain unit-stride loop to vectorize
+            dst = mix[p:p + length]
+            src = sounds_flat[off:off + length]
+            for j in range(length):
+                dst[j] += src[j] * gain
+
+
+# Sixteenth-note steps of a bar: every 4th hi-hat is accented, the rest soft
+ACCENT_STEPS = np.arange(0, 16, 4)
+SOFT_STEPS = np.setdiff1d(np.arange(16), ACCENT_STEPS)
+
+# House offbeat eighths: open hi-hat on 3 and 7, closed on 1 and 5
+OPEN_EIGHTHS = np.array([3, 7])
+CLOSED_EIGHTHS = np.array([1, 5])
 
 
 class BeatMaker:
     """Create drum beats and patterns with premium quality"""
     
+    # Beat pattern name -> builder method
+    _PATTERNS = {
+        'basic': '_create_basic_beat',
+        'trap': '_create_trap_beat',
+        'dnb': '_create_dnb_beat',
+        'house': '_create_house_beat',
+        'techno': '_create_techno_beat',
+    }
+    
+    # Custom pattern sound types: (kind, one-shot duration), indexed by sound ID
+    _CUSTOM_SOUNDS = (('kick', 0.3), ('snare', 0.2), ('hihat', 0.05))
+    _SOUND_IDS = {kind: sound_id for sound_id, (kind, _) in enumerate(_CUSTOM_SOUNDS)}
+    
+    # (kind, duration) one-shots used by the built-in patterns
+    _STANDARD_SOUNDS = (
+        ('kick', 0.2), ('kick', 0.3),
+        ('snare', 0.15), ('snare', 0.2),
+        ('hihat', 0.03), ('hihat', 0.05), ('hihat', 0.1), ('hihat', 0.15),
+    )
+    
+    # Drum one-shots as float32 samples, shared by every BeatMaker in the
+    # process and generated once per (work_rate, kind, duration)
+    _sound_cache: Dict[Tuple[int, str, float], np.ndarray] = {}
+    _sound_lock = threading.Lock()
+    
     def __init__(self, sample_rate: int = 96000):  # Premium quality
         self.sample_rate = sample_rate
-        self.generator = SoundGenerator(sample_rate)
+        
+        # Drums are synthesized and mixed at no more than 48 kHz and each bar
+        # is resampled once to sample_rate - half the buffer traffic at 96 kHz
+        self.work_rate = min(sample_rate, 48000)
+        self.generator = SoundGenerator(self.work_rate)
+        
+        # Note timings per BPM (read-only once computed)
+        self._timings: Dict[int, Dict[str, int]] = {}
+    
+    @classmethod
+    def prewarm(cls, sample_rate: int = 96000):
+        """
+        Generate the built-in patterns' one-shots ahead of time, so later
+        beats in this process (any BeatMaker at this rate) skip synthesis
+        
+        Args:
+            sample_rate: Output sample rate the beats will be created at
+        """
+        maker = cls(sample_rate)
+        for kind, duration in cls._STANDARD_SOUNDS:
+            maker._get_sound(kind, duration)
     
-    def create_beat(self, bpm: int = 120, bars: int = 4, pattern: str = "basic") -> AudioSegment:
+    def create_beat(self, bpm: int = 120, bars: int = 4, pattern: str = "basic",
+                    stereo_out: bool = False) -> AudioSegment:
         """
         Create a drum beat
         
@@ -22,235 +112,326 @@ class BeatMaker:
             bpm: Beats per minute
             bars: Number of bars (4 beats per bar)
             pattern: Beat pattern name
+            stereo_out: Return a 2-channel beat (rendering is always mono)
         
         Returns:
             Complete beat AudioSegment
         """
         pattern = pattern.lower()
         
-        if pattern == "basic":
-            return self._create_basic_beat(bpm, bars)
-        elif pattern == "trap":
-            return self._create_trap_beat(bpm, bars)
-        elif pattern == "dnb":
-            return self._create_dnb_beat(bpm, bars)
-        elif pattern == "house":
-            return self._create_house_beat(bpm, bars)
-        elif pattern == "techno":
-            return self._create_techno_beat(bpm, bars)
-        else:
+        builder = self._PATTERNS.get(pattern)
+        if builder is None:
             raise ValueError(f"Unknown pattern: {pattern}")
+        
+        beat = getattr(self, builder)(bpm, bars)
+        
+        # Duplicate to stereo only once the whole beat is rendered
+        return beat.set_channels(2) if stereo_out else beat
     
-    def _calculate_timing(self, bpm: int) -> Dict[str, float]:
-        """Calculate note timings based on BPM"""
-        beat_duration = 60.0 / bpm  # Duration of one beat in seconds
-        
-        return {
-            "bar": beat_duration * 4,      # 4 beats per bar
-            "beat": beat_duration,          # Quarter note
-            "eighth": beat_duration / 2,    # Eighth note
-            "sixteenth": beat_duration / 4, # Sixteenth note
-        }
+    def create_beats(self, jobs: List[Dict], max_workers: Optional[int] = None) -> List[AudioSegment]:
+        """
+        Create several drum beats concurrently
+        
+        Args:
+            jobs: List of create_beat keyword arguments
+                  Example: [{'bpm': 128, 'bars': 8, 'pattern': 'house'}, ...]
+            max_workers: Worker threads (default: ThreadPoolExecutor's)
+        
+        Returns:
+            Beat AudioSegments in the same order as jobs
+        """
+        # Mixing and resampling run in NumPy/SciPy, which release the GIL
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda job: self.create_beat(**job), jobs))
+    
+    def stream_to_file(self, path: str, bpm: int = 120, bars: int = 4,
+                       pattern: str = "basic", fmt: str = "wav") -> str:
+        """
+        Render a drum beat straight to disk, one bar at a time
+        
+        Only a single bar is ever held in memory, so arbitrarily long beats
+        can be written without materializing the whole AudioSegment
+        
+        Args:
+            path: Output file path
+            bpm: Beats per minute
+            bars: Number of bars (4 beats per bar)
+            pattern: Beat pattern name
+            fmt: Output format ("wav" is written directly, anything else is
+                 encoded by ffmpeg)
+        
+        Returns:
+            Output file path
+        """
+        bar = self.create_beat(bpm, 1, pattern)
+        raw = bar.raw_data
+        
+        if fmt == "wav":
+            with wave.open(path, 'wb') as wf:
+                wf.setnchannels(bar.channels)
+                wf.setsampwidth(bar.sample_width)
+                wf.setframerate(bar.frame_rate)
+                # Header sizes are patched once on close, not per bar
+                for _ in range(bars):
+                    wf.writeframesraw(raw)
+        else:
+            # Stream raw 16-bit PCM into the encoder's stdin
+            command = [get_encoder_name(), '-y',
+                       '-f', 's16le', '-ar', str(bar.frame_rate), '-ac', str(bar.channels),
+                       '-i', '-', '-f', fmt, path]
+            with subprocess.Popen(command, stdin=subprocess.PIPE,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) as encoder:
+                for _ in range(bars):
+                    encoder.stdin.write(raw)
+                encoder.stdin.close()
+            
+            if encoder.returncode != 0:
+                raise RuntimeError(f"Encoding {path} as {fmt} failed "
+                                   f"(exit code {encoder.returncode})")
+        
+        return path
+    
+    def _timing_samples(self, bpm: int) -> Dict[str, int]:
+        """Calculate note timings based on BPM, as whole samples at the work rate"""
+        timing = self._timings.get(bpm)
+        if timing is None:
+            sr = self.work_rate
+            
+            # setdefault keeps concurrent callers on a single shared dict;
+            # int() keeps the counts whole for a fractional bpm
+            timing = self._timings.setdefault(bpm, {
+                "bar": int(sr * 240 // bpm),       # 4 beats per bar
+                "beat": int(sr * 60 // bpm),       # Quarter note
+                "eighth": int(sr * 30 // bpm),     # Eighth note
+                "sixteenth": int(sr * 15 // bpm),  # Sixteenth note
+            })
+        
+        return timing
+    
+    def _get_sound(self, kind: str, duration: float) -> np.ndarray:
+        """
+        Get a drum one-shot (kick, snare, hihat) as float32 samples in
+        16-bit scale, generating it on first use
+        """
+        key = (self.work_rate, kind, duration)
+        sound = self._sound_cache.get(key)
+        if sound is None:
+            # Generate under the lock so concurrent beats share one one-shot
+            with self._sound_lock:
+                sound = self._sound_cache.get(key)
+                if sound is None:
+                    segment = self.generator.generate(kind, duration)
+                    sound = np.frombuffer(segment.raw_data, dtype=np.int16).astype(np.float32)
+                    sound.flags.writeable = False
+                    self._sound_cache[key] = sound
+        return sound
+    
+    def _mix(self, events: List[Tuple[np.ndarray, int, float]], total: int,
+             repeat: int = 1) -> AudioSegment:
+        """
+        Mix one-shots into a single float32 buffer at the work rate
+        
+        Args:
+            events: List of (samples, position, gain_db) tuples, positions in
+                    samples - the gain is applied while mixing, so no
+                    attenuated copy of a one-shot is ever made
+            total: Length of the mix in samples
+            repeat: Times to repeat the mix back to back (e.g. bars)
+        
+        Returns:
+            16-bit mono AudioSegment at sample_rate (sounds running past the
+            end are cut, as with AudioSegment.overlay)
+        """
+        mix = np.zeros(total, dtype=np.float32)
+        events = [event for event in events if event[1] < total]
+        
+        if NUMBA_AVAILABLE and events:
+            # Pack the distinct one-shots into one flat buffer and hand the
+            # whole event list to the JIT scatter in a single call
+            slots: Dict[int, int] = {}
+            arrays = []
+            for sound, _, _ in events:
+                if id(sound) not in slots:
+                    slots[id(sound)] = len(arrays)
+                    arrays.append(sound)
+            
+            lengths = np.array([len(a) for a in arrays], dtype=np.int64)
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            index = np.array([slots[id(sound)] for sound, _, _ in events])
+            positions = np.array([pos for _, pos, _ in events], dtype=np.int64)
+            gains_db = np.array([gain_db for _, _, gain_db in events], dtype=np.float32)
+            gains = np.power(np.float32(10), gains_db / 20)
+            
+            _scatter_add(mix, positions, np.concatenate(arrays),
+                         offsets[index], lengths[index], gains)
+        else:
+            for sound, pos, gain_db in events:
+                samples = sound[:total - pos]
+                if gain_db:
+                    samples = samples * np.float32(10 ** (gain_db / 20))
+                mix[pos:pos + len(samples)] += samples
+        
+        # Single resample to the output rate
+        if self.work_rate != self.sample_rate:
+            g = gcd(self.sample_rate, self.work_rate)
+            mix = signal.resample_poly(mix, self.sample_rate // g, self.work_rate // g)
+        
+        # Clip once at the end instead of saturating on every overlay
+        np.clip(mix, -32768, 32767, out=mix)
+        
+        # Every repeat is identical: replicate the final bytes in one copy
+        return AudioSegment(
+            mix.astype(np.int16).tobytes() * repeat,
+            frame_rate=self.sample_rate,
+            sample_width=2,
+            channels=1
+        )
     
     def _create_basic_beat(self, bpm: int, bars: int) -> AudioSegment:
         """
         Create a basic 4/4 beat
         Pattern: Kick on 1,3 | Snare on 2,4 | Hi-hat on eighth notes
         """
-        timing = self._calculate_timing(bpm)
+        timing = self._timing_samples(bpm)
         
         # Generate sounds
-        kick = self.generator.generate_kick(0.3)
-        snare = self.generator.generate_snare(0.2)
-        hihat = self.generator.generate_hihat(0.05)
+        kick = self._get_sound('kick', 0.3)
+        snare = self._get_sound('snare', 0.2)
+        hihat = self._get_sound('hihat', 0.05)
         
         # Create one bar
-        bar_duration_ms = int(timing["bar"] * 1000)
-        beat_duration_ms = int(timing["beat"] * 1000)
-        eighth_duration_ms = int(timing["eighth"] * 1000)
-        
-        # Start with silence
-        bar = AudioSegment.silent(duration=bar_duration_ms)
+        bar_samples = timing["bar"]
+        beat_samples = timing["beat"]
+        eighth_samples = timing["eighth"]
         
         # Add kicks on beats 1 and 3
-        bar = bar.overlay(kick, position=0)
-        bar = bar.overlay(kick, position=beat_duration_ms * 2)
+        events = [(kick, 0, 0), (kick, beat_samples * 2, 0)]
         
         # Add snares on beats 2 and 4
-        bar = bar.overlay(snare, position=beat_duration_ms)
-        bar = bar.overlay(snare, position=beat_duration_ms * 3)
+        events += [(snare, beat_samples, 0), (snare, beat_samples * 3, 0)]
         
         # Add hi-hats on every eighth note
-        for i in range(8):
-            bar = bar.overlay(hihat, position=eighth_duration_ms * i)
+        events += [(hihat, eighth_samples * i, 0) for i in range(8)]
         
-        # Repeat for number of bars
-        beat = bar
-        for _ in range(bars - 1):
-            beat = beat + bar
-        
-        return beat
+        # Mix one bar and repeat it for number of bars
+        return self._mix(events, bar_samples, bars)
     
     def _create_trap_beat(self, bpm: int, bars: int) -> AudioSegment:
         """
         Create a trap beat
         Pattern: Kick on 1,3.5 | Snare on 2,4 | Hi-hat rolls on sixteenth notes
         """
-        timing = self._calculate_timing(bpm)
+        timing = self._timing_samples(bpm)
         
         # Generate sounds
-        kick = self.generator.generate_kick(0.3)
-        snare = self.generator.generate_snare(0.2)
-        hihat = self.generator.generate_hihat(0.03)
-        hihat_open = self.generator.generate_hihat(0.1)
+        kick = self._get_sound('kick', 0.3)
+        snare = self._get_sound('snare', 0.2)
+        hihat = self._get_sound('hihat', 0.03)
+        hihat_open = self._get_sound('hihat', 0.1)
         
         # Create one bar
-        bar_duration_ms = int(timing["bar"] * 1000)
-        beat_duration_ms = int(timing["beat"] * 1000)
-        sixteenth_duration_ms = int(timing["sixteenth"] * 1000)
-        
-        bar = AudioSegment.silent(duration=bar_duration_ms)
+        bar_samples = timing["bar"]
+        beat_samples = timing["beat"]
+        sixteenth_samples = timing["sixteenth"]
         
         # Kick pattern: 1, 3.5
-        bar = bar.overlay(kick, position=0)
-        bar = bar.overlay(kick, position=beat_duration_ms * 2 + beat_duration_ms // 2)
+        events = [(kick, 0, 0), (kick, beat_samples * 2 + beat_samples // 2, 0)]
         
         # Snare on 2 and 4
-        bar = bar.overlay(snare, position=beat_duration_ms)
-        bar = bar.overlay(snare, position=beat_duration_ms * 3)
-        
-        # Hi-hat rolls (trap-style)
-        for i in range(16):
-            # Accent certain hi-hats
-            if i % 4 == 0:
-                bar = bar.overlay(hihat_open - 3, position=sixteenth_duration_ms * i)
-            else:
-                bar = bar.overlay(hihat - 6, position=sixteenth_duration_ms * i)
-        
-        # Repeat for number of bars
-        beat = bar
-        for _ in range(bars - 1):
-            beat = beat + bar
-        
-        return beat
+        events += [(snare, beat_samples, 0), (snare, beat_samples * 3, 0)]
+        
+        # Hi-hat rolls (trap-style): accented open hats, softer closed ones
+        events += [(hihat_open, pos, -3) for pos in (sixteenth_samples * ACCENT_STEPS).tolist()]
+        events += [(hihat, pos, -6) for pos in (sixteenth_samples * SOFT_STEPS).tolist()]
+        
+        # Mix one bar and repeat it for number of bars
+        return self._mix(events, bar_samples, bars)
     
     def _create_dnb_beat(self, bpm: int, bars: int) -> AudioSegment:
         """
         Create a drum and bass beat
         Pattern: Amen break inspired - complex kick/snare pattern
         """
-        timing = self._calculate_timing(bpm)
+        timing = self._timing_samples(bpm)
         
         # Generate sounds
-        kick = self.generator.generate_kick(0.2)
-        snare = self.generator.generate_snare(0.15)
-        hihat = self.generator.generate_hihat(0.03)
+        kick = self._get_sound('kick', 0.2)
+        snare = self._get_sound('snare', 0.15)
+        hihat = self._get_sound('hihat', 0.03)
         
-        bar_duration_ms = int(timing["bar"] * 1000)
-        beat_duration_ms = int(timing["beat"] * 1000)
-        sixteenth_duration_ms = int(timing["sixteenth"] * 1000)
-        
-        bar = AudioSegment.silent(duration=bar_duration_ms)
+        bar_samples = timing["bar"]
+        beat_samples = timing["beat"]
+        sixteenth_samples = timing["sixteenth"]
         
         # DnB kick pattern
-        kick_positions = [0, sixteenth_duration_ms * 7, beat_duration_ms * 2, 
-                         beat_duration_ms * 3 + sixteenth_duration_ms * 2]
-        for pos in kick_positions:
-            bar = bar.overlay(kick, position=pos)
+        kick_positions = [0, sixteenth_samples * 7, beat_samples * 2, 
+                         beat_samples * 3 + sixteenth_samples * 2]
+        events = [(kick, pos, 0) for pos in kick_positions]
         
         # DnB snare pattern (syncopated)
-        snare_positions = [sixteenth_duration_ms * 4, sixteenth_duration_ms * 12]
-        for pos in snare_positions:
-            bar = bar.overlay(snare, position=pos)
+        snare_positions = [sixteenth_samples * 4, sixteenth_samples * 12]
+        events += [(snare, pos, 0) for pos in snare_positions]
         
         # Fast hi-hats
-        for i in range(16):
-            bar = bar.overlay(hihat - 8, position=sixteenth_duration_ms * i)
-        
-        # Repeat for number of bars
-        beat = bar
-        for _ in range(bars - 1):
-            beat = beat + bar
+        events += [(hihat, sixteenth_samples * i, -8) for i in range(16)]
         
-        return beat
+        # Mix one bar and repeat it for number of bars
+        return self._mix(events, bar_samples, bars)
     
     def _create_house_beat(self, bpm: int, bars: int) -> AudioSegment:
         """
         Create a house beat
         Pattern: Four-on-the-floor kick, hi-hat on offbeats
         """
-        timing = self._calculate_timing(bpm)
+        timing = self._timing_samples(bpm)
         
         # Generate sounds
-        kick = self.generator.generate_kick(0.3)
-        hihat_closed = self.generator.generate_hihat(0.05)
-        hihat_open = self.generator.generate_hihat(0.15)
+        kick = self._get_sound('kick', 0.3)
+        hihat_closed = self._get_sound('hihat', 0.05)
+        hihat_open = self._get_sound('hihat', 0.15)
         
-        bar_duration_ms = int(timing["bar"] * 1000)
-        beat_duration_ms = int(timing["beat"] * 1000)
-        eighth_duration_ms = int(timing["eighth"] * 1000)
-        
-        bar = AudioSegment.silent(duration=bar_duration_ms)
+        bar_samples = timing["bar"]
+        beat_samples = timing["beat"]
+        eighth_samples = timing["eighth"]
         
         # Four-on-the-floor kicks (every beat)
-        for i in range(4):
-            bar = bar.overlay(kick, position=beat_duration_ms * i)
+        events = [(kick, beat_samples * i, 0) for i in range(4)]
         
         # Hi-hats on offbeats (eighth notes)
-        for i in range(8):
-            if i % 2 == 1:  # Offbeats
-                if i == 3 or i == 7:  # Open hi-hat occasionally
-                    bar = bar.overlay(hihat_open - 3, position=eighth_duration_ms * i)
-                else:
-                    bar = bar.overlay(hihat_closed, position=eighth_duration_ms * i)
-        
-        # Repeat for number of bars
-        beat = bar
-        for _ in range(bars - 1):
-            beat = beat + bar
-        
-        return beat
+        events += [(hihat_open, pos, -3) for pos in (eighth_samples * OPEN_EIGHTHS).tolist()]
+        events += [(hihat_closed, pos, 0) for pos in (eighth_samples * CLOSED_EIGHTHS).tolist()]
+        
+        # Mix one bar and repeat it for number of bars
+        return self._mix(events, bar_samples, bars)
     
     def _create_techno_beat(self, bpm: int, bars: int) -> AudioSegment:
         """
         Create a techno beat
         Pattern: Four-on-the-floor kick, offbeat hi-hats, occasional snare
         """
-        timing = self._calculate_timing(bpm)
+        timing = self._timing_samples(bpm)
         
         # Generate sounds
-        kick = self.generator.generate_kick(0.3)
-        snare = self.generator.generate_snare(0.15)
-        hihat = self.generator.generate_hihat(0.05)
-        
-        bar_duration_ms = int(timing["bar"] * 1000)
-        beat_duration_ms = int(timing["beat"] * 1000)
-        sixteenth_duration_ms = int(timing["sixteenth"] * 1000)
+        kick = self._get_sound('kick', 0.3)
+        snare = self._get_sound('snare', 0.15)
+        hihat = self._get_sound('hihat', 0.05)
         
-        bar = AudioSegment.silent(duration=bar_duration_ms)
+        bar_samples = timing["bar"]
+        beat_samples = timing["beat"]
+        sixteenth_samples = timing["sixteenth"]
         
         # Four-on-the-floor kicks
-        for i in range(4):
-            bar = bar.overlay(kick, position=beat_duration_ms * i)
+        events = [(kick, beat_samples * i, 0) for i in range(4)]
         
         # Snare on 2 and 4 (lighter than in other genres)
-        bar = bar.overlay(snare - 12, position=beat_duration_ms)
-        bar = bar.overlay(snare - 12, position=beat_duration_ms * 3)
-        
-        # Sixteenth note hi-hats
-        for i in range(16):
-            # Accent every 4th hi-hat
-            if i % 4 == 0:
-                bar = bar.overlay(hihat - 3, position=sixteenth_duration_ms * i)
-            else:
-                bar = bar.overlay(hihat - 8, position=sixteenth_duration_ms * i)
-        
-        # Repeat for number of bars
-        beat = bar
-        for _ in range(bars - 1):
-            beat = beat + bar
-        
-        return beat
+        events += [(snare, beat_samples, -12), (snare, beat_samples * 3, -12)]
+        
+        # Sixteenth note hi-hats: accent every 4th
+        events += [(hihat, pos, -3) for pos in (sixteenth_samples * ACCENT_STEPS).tolist()]
+        events += [(hihat, pos, -8) for pos in (sixteenth_samples * SOFT_STEPS).tolist()]
+        
+        # Mix one bar and repeat it for number of bars
+        return self._mix(events, bar_samples, bars)
     
     def create_custom_pattern(self, bpm: int, bars: int, pattern: List[Dict]) -> AudioSegment:
         """
@@ -265,36 +446,27 @@ class BeatMaker:
         Returns:
             Custom beat AudioSegment
         """
-        timing = self._calculate_timing(bpm)
-        bar_duration_ms = int(timing["bar"] * 1000)
-        beat_duration_ms = int(timing["beat"] * 1000)
-        
-        # Create empty bar
-        bar = AudioSegment.silent(duration=bar_duration_ms)
-        
-        # Add sounds according to pattern
-        for event in pattern:
-            sound_type = event['sound']
-            position = event['position']  # Position in beats
-            position_ms = int(position * beat_duration_ms)
-            
-            # Generate sound
-            if sound_type == 'kick':
-                sound = self.generator.generate_kick(0.3)
-            elif sound_type == 'snare':
-                sound = self.generator.generate_snare(0.2)
-            elif sound_type == 'hihat':
-                sound = self.generator.generate_hihat(0.05)
-            else:
-                continue
-            
-            # Overlay sound
-            if position_ms < bar_duration_ms:
-                bar = bar.overlay(sound, position=position_ms)
-        
-        # Repeat for number of bars
-        beat = bar
-        for _ in range(bars - 1):
-            beat = beat + bar
-        
-        return beat
+        timing = self._timing_samples(bpm)
+        bar_samples = timing["bar"]
+        beat_samples = timing["beat"]
+        
+        # Pattern as parallel arrays: sound ID (255 = unsupported, skipped)
+        # and position (in beats) per event, mapped from strings only once
+        sound_ids = np.fromiter((self._SOUND_IDS.get(event['sound'], 255) for event in pattern),
+                                dtype=np.uint8, count=len(pattern))
+        positions = np.fromiter((event['position'] for event in pattern),
+                                dtype=np.float64, count=len(pattern))
+        positions = (positions * beat_samples).astype(np.int64)
+        in_bar = positions < bar_samples
+        
+        # Add sounds according to pattern, grouped by type so each one-shot
+        # is fetched once and all its hits are added back to back
+        events = []
+        for sound_id, (sound_type, duration) in enumerate(self._CUSTOM_SOUNDS):
+            hits = positions[in_bar & (sound_ids == sound_id)]
+            if len(hits):
+                sound = self._get_sound(sound_type, duration)
+                events += [(sound, position, 0) for position in hits.tolist()]
+        
+        # Mix one bar and repeat it for number of bars
+        return self._mix(events, bar_samples, bars)
@@ -7,18 +7,201 @@ from src.music_theory import MusicTheory
 from src.sounds import SoundGenerator
 from src.beat_maker import BeatMaker
 from src.variation_engine import VariationEngine
-import random
-from typing import Dict, List, Optional
+from src import _audio_kernels
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import functools
+from math import gcd
+import os
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 import numpy as np
+from scipy import signal
 
 
+# Composition presets per genre, shared read-only by every composer
+_GENRE_PRESETS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    'lofi': MappingProxyType({
+        'scale': 'minor',
+        'progression_style': 'lofi',
+        'beat_pattern': 'lofi',
+        'melody_style': 'smooth',
+        'bass_pattern': 'root',
+        'chord_voicing': 'piano',  # Use piano for lofi
+        'melody_octave': 5,
+        'bass_volume': 4,
+        'chord_volume': 8,
+        'melody_volume': 5,
+        'swing': 0.6,
+        'reverb': 0.4,
+        'ambient': True,  # Add ambient texture
+    }),
+    'electro': MappingProxyType({
+        'scale': 'minor',
+        'progression_style': 'edm',
+        'beat_pattern': 'house',
+        'melody_style': 'jumpy',
+        'bass_pattern': 'fifth',
+        'chord_voicing': 'bright',
+        'melody_octave': 6,
+        'bass_volume': 2,
+        'chord_volume': 6,
+        'melody_volume': 3,
+        'swing': 0,
+        'reverb': 0.3,
+        'ambient': False,
+    }),
+    'funk': MappingProxyType({
+        'scale': 'minor',
+        'progression_style': 'funk',
+        'beat_pattern': 'funk',
+        'melody_style': 'syncopated',
+        'bass_pattern': 'walking',
+        'chord_voicing': 'piano',  # Piano for funk too
+        'melody_octave': 5,
+        'bass_volume': 1,
+        'chord_volume': 7,
+        'melody_volume': 4,
+        'swing': 0.7,
+        'reverb': 0.2,
+        'ambient': False,
+    }),
+    'relax': MappingProxyType({
+        'scale': 'major',
+        'progression_style': 'pop',
+        'beat_pattern': 'ambient',
+        'melody_style': 'smooth',
+        'bass_pattern': 'root',
+        'chord_voicing': 'pad',  # Use pads for relax
+        'melody_octave': 5,
+        'bass_volume': 6,
+        'chord_volume': 5,
+        'melody_volume': 4,
+        'swing': 0,
+        'reverb': 0.6,
+        'ambient': True,
+    }),
+    'ambient': MappingProxyType({
+        'scale': 'major',
+        'progression_style': 'pop',
+        'beat_pattern': None,  # No drums
+        'melody_style': 'smooth',
+        'bass_pattern': 'root',
+        'chord_voicing': 'pad',  # Pads for ambient
+        'melody_octave': 5,
+        'bass_volume': 8,
+        'chord_volume': 4,
+        'melody_volume': 5,
+        'swing': 0,
+        'reverb': 0.8,
+        'ambient': True,
+    }),
+    'synthwave': MappingProxyType({
+        'scale': 'minor',
+        'progression_style': 'edm',
+        'beat_pattern': 'synthwave',
+        'melody_style': 'arpeggio',
+        'bass_pattern': 'fifth',
+        'chord_voicing': 'synth',
+        'melody_octave': 6,
+        'bass_volume': 3,
+        'chord_volume': 6,
+        'melody_volume': 2,
+        'swing': 0,
+        'reverb': 0.5,
+        'ambient': True,  # Add ambient for atmosphere
+    }),
+})
+
+
+@dataclass(frozen=True)
+class TrackTiming:
+    """Tempo grid of a track or section, computed once and shared by every stem"""
+    bpm: int
+    bars: int
+    beat_ms: int
+    bar_ms: int
+    sixteenth_ms: int
+    total_ms: int
+    
+    @classmethod
+    def for_tempo(cls, bpm: int, bars: int) -> 'TrackTiming':
+        """Snap the beat to whole milliseconds and derive the rest from it"""
+        beat_ms = int(60000 / bpm)
+        return cls(bpm=bpm, bars=bars, beat_ms=beat_ms, bar_ms=beat_ms * 4,
+                   sixteenth_ms=beat_ms // 4, total_ms=beat_ms * 4 * bars)
+
+
+# Scale lookups for the module-level caches below
+_THEORY = MusicTheory()
+
+
+@functools.lru_cache(maxsize=64)
+def _extended_scale(key: str, scale: str,
+                    octave: int) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """
+    Get a scale spread over the octave below, the octave itself and the
+    octave above
+    
+    Returns:
+        (note names, read-only float64 frequencies), computed once per
+        (key, scale, octave) and shared by every composer
+    """
+    scale_notes = _THEORY.get_scale_notes(key, scale, octave)
+    names = tuple(name for name, _ in scale_notes) * 3
+    base = np.array([freq for _, freq in scale_notes])
+    freqs = np.concatenate([base * (2.0 ** shift) for shift in (-1, 0, 1)])
+    freqs.flags.writeable = False
+    return names, freqs
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_drum_hit(kind: str, duration: float, sample_rate: int) -> AudioSegment:
+    """
+    Synthesize a drum one-shot once per (kind, duration, sample rate)
+    
+    AudioSegments are immutable, so every composer - and every section of a
+    continuous or infinite stream - shares the same hits
+    """
+    generator = SoundGenerator(sample_rate=sample_rate)
+    if kind == 'kick':
+        return generator.generate_kick(duration)
+    if kind == 'snare':
+        return generator.generate_snare(duration)
+    return generator.generate_hihat(duration)
+
+
+# Each texture is a full-length track (several MB at 48kHz), so only the
+# most recently used few are kept
+@functools.lru_cache(maxsize=4)
+def _cached_ambient_texture(texture_type: str, duration: float,
+                            sample_rate: int) -> AudioSegment:
+    """
+    Generate an ambient texture once per (type, duration, sample rate),
+    shared by every composer like the drum hits
+    """
+    generator = SoundGenerator(sample_rate=sample_rate)
+    return generator.generate_ambient_texture(duration=duration,
+                                              texture_type=texture_type)
+
 class AutoComposer:
     """Automatic music composition engine with premium quality"""
     
-    def __init__(self):
+    def __init__(self, sample_rate: int = 48000, premium: bool = False):
+        """
+        Initialize composer
+        
+        Args:
+            sample_rate: Internal synthesis and mixing rate in Hz (default
+                         48kHz - the stems carry no content above 24kHz)
+            premium: Upsample finished tracks once to 96kHz
+        """
         self.theory = MusicTheory()
-        self.generator = SoundGenerator(sample_rate=96000)  # Premium 96kHz
-        self.beat_maker = BeatMaker(sample_rate=96000)
+        self.sample_rate = sample_rate
+        self.output_rate = 96000 if premium else sample_rate
+        self.generator = SoundGenerator(sample_rate=sample_rate)
+        self.beat_maker = BeatMaker(sample_rate=sample_rate)
+        _audio_kernels.warm_cache()
         self.variation_engine = VariationEngine()
     
     def compose_track(self, genre: str = 'lofi', duration_bars: int = 16,
@@ -39,274 +222,301 @@ class AutoComposer:
         preset = self.get_genre_preset(genre)
         
         # Generate BPM
-        bpm = self.theory.get_bpm_for_genre(genre)
+        timing = TrackTiming.for_tempo(self.theory.get_bpm_for_genre(genre), duration_bars)
         
         # Get chord progression
         progression = self.theory.get_progression(key, preset['progression_style'])
         
-        # Generate elements
-        drums = self._generate_drums(bpm, duration_bars, preset)
-        bass = self._generate_bass(progression, bpm, duration_bars, preset)
-        chords = self._generate_chords(progression, bpm, duration_bars, preset)
-        melody = self._generate_melody(key, preset['scale'], bpm, duration_bars, preset)
-        
-        # Add ambient texture if specified
+        # Choose ambient texture type based on genre
+        texture_type = None
         if preset.get('ambient', False):
-            beat_ms = int(60000 / bpm)
-            duration_seconds = (beat_ms * 4 * duration_bars) / 1000
-            
-            # Choose texture type based on genre
             if genre.lower() == 'lofi':
                 texture_type = 'warm'
             elif genre.lower() in ['ambient', 'relax']:
                 texture_type = 'spacey'
             else:
                 texture_type = 'bright'
-            
-            ambient = self.generator.generate_ambient_texture(
-                duration=duration_seconds,
-                texture_type=texture_type
-            )
-            # Trim to exact length
-            ambient = ambient[:len(drums)]
-        else:
-            ambient = AudioSegment.silent(duration=len(drums))
         
-        # Add sub-bass for extra depth
-        sub_bass = self._generate_sub_bass(progression, bpm, duration_bars)
-        
-        # Mix all elements
-        track = drums
-        track = track.overlay(sub_bass - 2)  # Sub-bass sits below main bass
-        track = track.overlay(bass - preset.get('bass_volume', 3))
-        track = track.overlay(chords - preset.get('chord_volume', 6))
-        track = track.overlay(melody - preset.get('melody_volume', 3))
-        track = track.overlay(ambient - 12)  # Ambient texture in background
+        # Generate elements concurrently - the stems are independent, and
+        # their heavy lifting (NumPy, scipy, JIT kernels) releases the GIL
+        with ThreadPoolExecutor(max_workers=min(6, os.cpu_count() or 1)) as executor:
+            drums_future = executor.submit(self._generate_drums, timing, preset)
+            bass_future = executor.submit(self._generate_bass, progression, timing, preset)
+            chords_future = executor.submit(self._generate_chords, progression, timing, preset)
+            melody_future = executor.submit(self._generate_melody, key, preset['scale'],
+                                            timing, preset)
+            # Add sub-bass for extra depth
+            sub_bass_future = executor.submit(self._generate_sub_bass, progression, timing)
+            
+            # Add ambient texture if specified
+            ambient_future = None
+            if texture_type is not None:
+                duration_seconds = timing.total_ms / 1000
+                ambient_future = executor.submit(_cached_ambient_texture, texture_type,
+                                                 duration_seconds, self.sample_rate)
+            
+            drums = drums_future.result()
+            bass = bass_future.result()
+            chords = chords_future.result()
+            melody = melody_future.result()
+            sub_bass = sub_bass_future.result()
+            # The mix cuts the ambient texture to the drums' length
+            ambient = ambient_future.result() if ambient_future is not None else None
+        
+        # Mix all elements in one pass
+        stems = [
+            (drums, 0),
+            (sub_bass, -2),  # Sub-bass sits below main bass
+            (bass, -preset.get('bass_volume', 3)),
+            (chords, -preset.get('chord_volume', 6)),
+            (melody, -preset.get('melody_volume', 3)),
+        ]
+        if ambient is not None:
+            stems.append((ambient, -12))  # Ambient texture in background
+        track = self._mix_stems(stems)
         
         # Apply genre-specific effects
         track = self._apply_genre_effects(track, genre)
         
         return track
     
-    def get_genre_preset(self, genre: str) -> Dict:
-        """Get composition preset for genre"""
-        presets = {
-            'lofi': {
-                'scale': 'minor',
-                'progression_style': 'lofi',
-                'beat_pattern': 'lofi',
-                'melody_style': 'smooth',
-                'bass_pattern': 'root',
-                'chord_voicing': 'piano',  # Use piano for lofi
-                'melody_octave': 5,
-                'bass_volume': 4,
-                'chord_volume': 8,
-                'melody_volume': 5,
-                'swing': 0.6,
-                'reverb': 0.4,
-                'ambient': True,  # Add ambient texture
-            },
-            'electro': {
-                'scale': 'minor',
-                'progression_style': 'edm',
-                'beat_pattern': 'house',
-                'melody_style': 'jumpy',
-                'bass_pattern': 'fifth',
-                'chord_voicing': 'bright',
-                'melody_octave': 6,
-                'bass_volume': 2,
-                'chord_volume': 6,
-                'melody_volume': 3,
-                'swing': 0,
-                'reverb': 0.3,
-                'ambient': False,
-            },
-            'funk': {
-                'scale': 'minor',
-                'progression_style': 'funk',
-                'beat_pattern': 'funk',
-                'melody_style': 'syncopated',
-                'bass_pattern': 'walking',
-                'chord_voicing': 'piano',  # Piano for funk too
-                'melody_octave': 5,
-                'bass_volume': 1,
-                'chord_volume': 7,
-                'melody_volume': 4,
-                'swing': 0.7,
-                'reverb': 0.2,
-                'ambient': False,
-            },
-            'relax': {
-                'scale': 'major',
-                'progression_style': 'pop',
-                'beat_pattern': 'ambient',
-                'melody_style': 'smooth',
-                'bass_pattern': 'root',
-                'chord_voicing': 'pad',  # Use pads for relax
-                'melody_octave': 5,
-                'bass_volume': 6,
-                'chord_volume': 5,
-                'melody_volume': 4,
-                'swing': 0,
-                'reverb': 0.6,
-                'ambient': True,
-            },
-            'ambient': {
-                'scale': 'major',
-                'progression_style': 'pop',
-                'beat_pattern': None,  # No drums
-                'melody_style': 'smooth',
-                'bass_pattern': 'root',
-                'chord_voicing': 'pad',  # Pads for ambient
-                'melody_octave': 5,
-                'bass_volume': 8,
-                'chord_volume': 4,
-                'melody_volume': 5,
-                'swing': 0,
-                'reverb': 0.8,
-                'ambient': True,
-            },
-            'synthwave': {
-                'scale': 'minor',
-                'progression_style': 'edm',
-                'beat_pattern': 'synthwave',
-                'melody_style': 'arpeggio',
-                'bass_pattern': 'fifth',
-                'chord_voicing': 'synth',
-                'melody_octave': 6,
-                'bass_volume': 3,
-                'chord_volume': 6,
-                'melody_volume': 2,
-                'swing': 0,
-                'reverb': 0.5,
-                'ambient': True,  # Add ambient for atmosphere
-            },
-        }
-        
-        return presets.get(genre.lower(), presets['lofi'])
+    def _mix_stems(self, stems: List[Tuple[AudioSegment, float]]) -> AudioSegment:
+        """
+        Mix stems into a single float32 buffer
+        
+        Args:
+            stems: List of (segment, gain_db) tuples - the first stem sets
+                   the length of the mix, as the base of AudioSegment.overlay
+        
+        Returns:
+            16-bit AudioSegment at the highest frame rate and channel count
+            of the stems, clipped once at the end
+        """
+        frame_rate = max(seg.frame_rate for seg, _ in stems)
+        channels = max(seg.channels for seg, _ in stems)
+        
+        mix = None
+        for seg, gain_db in stems:
+            # Only the silent placeholders differ in format; convert them
+            # the way overlay would
+            if seg.frame_rate != frame_rate:
+                seg = seg.set_frame_rate(frame_rate)
+            if seg.sample_width != 2:
+                seg = seg.set_sample_width(2)
+            
+            samples = np.frombuffer(seg.raw_data, dtype=np.int16).reshape(-1, seg.channels)
+            if mix is None:
+                mix = np.zeros((len(samples), channels), dtype=np.float32)
+            
+            gain = np.float32(10 ** (gain_db / 20))
+            if _audio_kernels.NUMBA_AVAILABLE:
+                # Fused multiply-add straight from the int16 stem
+                _audio_kernels.mix_add(mix, samples, gain, 0)
+            else:
+                # Mono stems broadcast across every channel of the mix
+                samples = samples[:len(mix)]
+                if gain_db:
+                    mix[:len(samples)] += samples * gain
+                else:
+                    mix[:len(samples)] += samples
+        
+        return self._mix_to_segment(mix, frame_rate)
+    
+    @staticmethod
+    def _mix_to_segment(mix: np.ndarray, frame_rate: int) -> AudioSegment:
+        """Clip a float mix to 16-bit once and wrap it in an AudioSegment"""
+        # Clip straight into the int16 output - no float temporary
+        out = np.empty(mix.shape, dtype=np.int16)
+        if _audio_kernels.NUMBA_AVAILABLE:
+            _audio_kernels.clip_to_i16(mix, out)
+        else:
+            np.clip(mix, -32768, 32767, out=out, casting='unsafe')
+        
+        return AudioSegment(
+            out.tobytes(),
+            frame_rate=frame_rate,
+            sample_width=2,
+            channels=mix.shape[1]
+        )
+    
+    def get_genre_preset(self, genre: str) -> Mapping[str, Any]:
+        """Get composition preset for genre (a shared, read-only mapping)"""
+        return _GENRE_PRESETS.get(genre.lower(), _GENRE_PRESETS['lofi'])
     
-    def _generate_drums(self, bpm: int, bars: int, preset: Dict) -> AudioSegment:
+    def _generate_drums(self, timing: TrackTiming, preset: Dict) -> AudioSegment:
         """Generate drum pattern"""
         beat_pattern = preset.get('beat_pattern')
         
         if beat_pattern is None or beat_pattern == 'ambient':
             # No drums or very minimal
-            duration_ms = int((60000 / bpm) * 4 * bars)
-            return AudioSegment.silent(duration=duration_ms)
+            return AudioSegment.silent(duration=timing.total_ms, frame_rate=self.generator.sample_rate)
         
         if beat_pattern == 'lofi':
-            return self._generate_lofi_drums(bpm, bars)
+            return self._generate_lofi_drums(timing)
         elif beat_pattern == 'funk':
-            return self._generate_funk_drums(bpm, bars)
+            return self._generate_funk_drums(timing)
         elif beat_pattern == 'synthwave':
-            return self._generate_synthwave_drums(bpm, bars)
+            return self._generate_synthwave_drums(timing)
         else:
             # Use existing beat maker
-            return self.beat_maker.create_beat(bpm, bars, beat_pattern)
+            return self.beat_maker.create_beat(timing.bpm, timing.bars, beat_pattern)
     
-    def _generate_lofi_drums(self, bpm: int, bars: int) -> AudioSegment:
+    def _generate_lofi_drums(self, timing: TrackTiming) -> AudioSegment:
         """Generate lo-fi style drums with swing"""
         # Similar to basic but with swing and softer sounds
-        beat_ms = int(60000 / bpm)
-        bar_ms = beat_ms * 4
-        
-        # Generate softer drum sounds
-        kick = self.generator.generate_kick(0.3) - 3
-        snare = self.generator.generate_snare(0.15) - 6
-        hihat = self.generator.generate_hihat(0.05) - 8
+        beat_ms = timing.beat_ms
         
-        bar = AudioSegment.silent(duration=bar_ms)
+        # Softer drum sounds - the gains are applied while mixing the bar
+        kick = self._drum_hit('kick', 0.3)
+        snare = self._drum_hit('snare', 0.15)
+        hihat = self._drum_hit('hihat', 0.05)
         
         # Kick on 1 and 3
-        bar = bar.overlay(kick, position=0)
-        bar = bar.overlay(kick, position=beat_ms * 2)
+        hits = [(0, kick, -3), (beat_ms * 2, kick, -3)]
         
         # Snare on 2 and 4 (slightly delayed for swing)
         swing_delay = int(beat_ms * 0.1)
-        bar = bar.overlay(snare, position=beat_ms + swing_delay)
-        bar = bar.overlay(snare, position=beat_ms * 3 + swing_delay)
+        hits += [(beat_ms + swing_delay, snare, -6), (beat_ms * 3 + swing_delay, snare, -6)]
         
         # Sparse hi-hats
-        for i in [0, 2, 4, 6]:
-            pos = int(beat_ms * i / 2)
-            bar = bar.overlay(hihat, position=pos)
+        hits += [(int(beat_ms * i / 2), hihat, -8) for i in [0, 2, 4, 6]]
         
-        # Repeat bars
-        result = bar
-        for _ in range(bars - 1):
-            result = result + bar
-        
-        return result
+        bar = self._render_sequence(hits, timing.bar_ms, self.generator.sample_rate)
+        return self._repeat_segment(bar, timing.bars)
     
-    def _generate_funk_drums(self, bpm: int, bars: int) -> AudioSegment:
+    def _generate_funk_drums(self, timing: TrackTiming) -> AudioSegment:
         """Generate funky drum pattern"""
-        beat_ms = int(60000 / bpm)
-        bar_ms = beat_ms * 4
-        sixteenth_ms = beat_ms // 4
+        beat_ms = timing.beat_ms
+        sixteenth_ms = timing.sixteenth_ms
         
-        kick = self.generator.generate_kick(0.25)
-        snare = self.generator.generate_snare(0.15)
-        hihat = self.generator.generate_hihat(0.04)
-        
-        bar = AudioSegment.silent(duration=bar_ms)
+        kick = self._drum_hit('kick', 0.25)
+        snare = self._drum_hit('snare', 0.15)
+        hihat = self._drum_hit('hihat', 0.04)
         
         # Funky kick pattern
         kick_positions = [0, sixteenth_ms * 6, beat_ms * 2, sixteenth_ms * 14]
-        for pos in kick_positions:
-            bar = bar.overlay(kick, position=pos)
+        hits = [(pos, kick, 0) for pos in kick_positions]
         
         # Snare on 2 and 4
-        bar = bar.overlay(snare, position=beat_ms)
-        bar = bar.overlay(snare, position=beat_ms * 3)
+        hits += [(beat_ms, snare, 0), (beat_ms * 3, snare, 0)]
         
         # Sixteenth note hi-hats
         for i in range(16):
             # Ghost notes on off-beats
             volume_adjust = -3 if i % 2 == 0 else -8
-            bar = bar.overlay(hihat + volume_adjust, position=sixteenth_ms * i)
-        
-        result = bar
-        for _ in range(bars - 1):
-            result = result + bar
+            hits.append((sixteenth_ms * i, hihat, volume_adjust))
         
-        return result
+        bar = self._render_sequence(hits, timing.bar_ms, self.generator.sample_rate)
+        return self._repeat_segment(bar, timing.bars)
+    
+    def _drum_hit(self, kind: str, duration: float) -> AudioSegment:
+        """Get a drum one-shot at this composer's synthesis rate"""
+        return _cached_drum_hit(kind, duration, self.generator.sample_rate)
+    
+    @staticmethod
+    def _repeat_segment(seg: AudioSegment, n: int) -> AudioSegment:
+        """
+        Repeat a segment back to back n times with a single copy of its PCM
+        (any sample width or channel count - whole frames are repeated)
+        """
+        return seg._spawn(seg.raw_data * n)
     
-    def _generate_synthwave_drums(self, bpm: int, bars: int) -> AudioSegment:
+    def _generate_synthwave_drums(self, timing: TrackTiming) -> AudioSegment:
         """Generate synthwave style drums"""
         # Electronic, quantized, four-on-the-floor
-        return self.beat_maker.create_beat(bpm, bars, 'house')
+        return self.beat_maker.create_beat(timing.bpm, timing.bars, 'house')
     
-    def _generate_sub_bass(self, progression: List, bpm: int, bars: int) -> AudioSegment:
-        """Generate sub-bass layer (below 100Hz)"""
-        beat_ms = int(60000 / bpm)
-        note_duration = (beat_ms * 4) / 1000  # Duration in seconds
+    def _render_sequence(self, events: List[Tuple[float, AudioSegment, float]],
+                         total_ms: float, frame_rate: int,
+                         cycle_ms: Optional[float] = None) -> AudioSegment:
+        """
+        Render timed notes into one preallocated buffer
         
-        sub_bass_audio = AudioSegment.silent(duration=0)
+        Args:
+            events: List of (position_ms, segment, gain_db) tuples - the gain
+                    is applied while mixing, and notes that overlap are
+                    summed, as with AudioSegment.overlay
+            total_ms: Length of the sequence in milliseconds
+            frame_rate: Output frame rate
+            cycle_ms: If set, events describe one cycle of this length; the
+                      cycle is rendered once and repeated up to total_ms,
+                      tails that ring past a cycle included
         
-        # Repeat progression for all bars
-        repeats = bars // len(progression)
-        if bars % len(progression) != 0:
-            repeats += 1
+        Returns:
+            16-bit mono AudioSegment (notes running past the end are cut)
+        """
+        total = int(total_ms * frame_rate / 1000)
+        
+        # Decode every note once at the output rate
+        notes = []
+        for pos_ms, seg, gain_db in events:
+            start = int(pos_ms * frame_rate / 1000)
+            if start >= total:
+                continue
+            if seg.frame_rate != frame_rate:
+                seg = seg.set_frame_rate(frame_rate)
+            notes.append((start, np.frombuffer(seg.raw_data, dtype=np.int16).reshape(-1, 1),
+                          gain_db))
+        
+        if cycle_ms is None:
+            mix = np.zeros((total, 1), dtype=np.float32)
+            self._add_notes(mix, notes)
+            return self._mix_to_segment(mix, frame_rate)
+        
+        # One cycle, long enough to hold the tails of its last notes
+        span = min(total, max((start + len(samples) for start, samples, _ in notes), default=0))
+        cycle = np.zeros((span, 1), dtype=np.float32)
+        self._add_notes(cycle, notes)
+        
+        mix = np.zeros((total, 1), dtype=np.float32)
+        step = int(cycle_ms * frame_rate / 1000)
+        for start in range(0, total, step):
+            n = min(span, total - start)
+            mix[start:start + n] += cycle[:n]
+        
+        return self._mix_to_segment(mix, frame_rate)
+    
+    @staticmethod
+    def _add_notes(mix: np.ndarray, notes: List[Tuple[int, np.ndarray, float]]):
+        """Sum (start, int16 samples, gain_db) notes into a float mix"""
+        total = len(mix)
+        for start, samples, gain_db in notes:
+            if start >= total:
+                continue
+            gain = np.float32(10 ** (gain_db / 20))
+            if _audio_kernels.NUMBA_AVAILABLE:
+                _audio_kernels.mix_add(mix, samples, gain, start)
+            else:
+                samples = samples[:total - start]
+                if gain_db:
+                    mix[start:start + len(samples)] += samples * gain
+                else:
+                    mix[start:start + len(samples)] += samples
+    
+    def _generate_sub_bass(self, progression: List, timing: TrackTiming) -> AudioSegment:
+        """Generate sub-bass layer (below 100Hz)"""
+        bar_ms = timing.bar_ms
+        note_duration = bar_ms / 1000  # Duration in seconds
+        
+        # One sub note per chord, one chord per bar
+        notes = []
+        for root, chord_type in progression:
+            # Get root note frequency and transpose down 2 octaves
+            root_freq = self.theory.note_to_freq(root, octave=2)
+            sub_freq = int(root_freq / 2)  # One octave lower
+            
+            notes.append(self.generator.generate_sub_bass(
+                frequency=sub_freq,
+                duration=note_duration
+            ))
         
-        for _ in range(repeats):
-            for root, chord_type in progression:
-                # Get root note frequency and transpose down 2 octaves
-                root_freq = self.theory.note_to_freq(root, octave=2)
-                sub_freq = int(root_freq / 2)  # One octave lower
-                
-                # Generate sub-bass
-                sub = self.generator.generate_sub_bass(
-                    frequency=sub_freq,
-                    duration=note_duration
-                )
-                
-                sub_bass_audio = sub_bass_audio + sub
+        # Render one pass of the progression and repeat it for all bars
+        events = [(bar * bar_ms, notes[bar], 0) for bar in range(len(notes))]
         
-        # Trim to exact length
-        total_duration = beat_ms * 4 * bars
-        return sub_bass_audio[:total_duration]
+        return self._render_sequence(events, timing.total_ms, self.generator.sample_rate,
+                                     cycle_ms=bar_ms * len(notes))
     
-    def _generate_bass(self, progression: List, bpm: int, bars: int, 
+    def _generate_bass(self, progression: List, timing: TrackTiming,
                       preset: Dict) -> AudioSegment:
         """Generate bassline"""
         pattern = preset.get('bass_pattern', 'root')
@@ -316,105 +526,119 @@ class AutoComposer:
         bassline_freqs = self.theory.generate_bassline(progression, octave, pattern)
         
         # Calculate timing
-        beat_ms = int(60000 / bpm)
+        beat_ms = timing.beat_ms
         note_duration = 0.8  # Slightly shorter for groove
         
-        # Generate bass sounds
-        bass = AudioSegment.silent(duration=0)
-        
-        # Repeat bassline for all bars
-        repeats = bars // len(progression)
-        if bars % len(progression) != 0:
-            repeats += 1
+        # Generate bass sounds, one per distinct frequency
+        notes: Dict[int, AudioSegment] = {}
+        for freq in bassline_freqs:
+            if int(freq) not in notes:
+                notes[int(freq)] = self.generator.generate_bass(note_duration, int(freq))
         
-        for _ in range(repeats):
-            for freq in bassline_freqs:
-                note = self.generator.generate_bass(note_duration, int(freq))
-                # Add slight silence between notes
-                note = note + AudioSegment.silent(duration=int(beat_ms - len(note)))
-                bass = bass + note
+        # One note per beat: render the bassline once and repeat it for all bars
+        events = [
+            (beat * beat_ms, notes[int(freq)], 0)
+            for beat, freq in enumerate(bassline_freqs)
+        ]
         
-        # Trim to exact length
-        total_duration = beat_ms * 4 * bars
-        return bass[:total_duration]
+        return self._render_sequence(events, timing.total_ms, self.generator.sample_rate,
+                                     cycle_ms=beat_ms * len(bassline_freqs))
     
-    def _generate_chords(self, progression: List, bpm: int, bars: int,
+    def _generate_chords(self, progression: List, timing: TrackTiming,
                         preset: Dict) -> AudioSegment:
         """Generate chord progression with improved sound"""
-        beat_ms = int(60000 / bpm)
-        chord_duration = (beat_ms * 4) / 1000  # Duration in seconds
+        bar_ms = timing.bar_ms
+        chord_duration = bar_ms / 1000  # Duration in seconds
         
-        chords_audio = AudioSegment.silent(duration=0)
         voicing = preset.get('chord_voicing', 'warm')
+        frame_rate = self.generator.sample_rate
+        cycle_ms = bar_ms * len(progression)
+        
+        if voicing not in ('piano', 'pad'):
+            # Standard synth chords are plain sines: lay every chord tone of
+            # one pass of the progression out as flat per-note columns and
+            # render them in a single pass
+            chord_table = [
+                [int(freq) for freq in self.theory.get_chord(root, chord_type, octave=3)]
+                for root, chord_type in progression
+            ]
+            freqs = np.array([freq for chord in chord_table for freq in chord])
+            starts_ms = np.repeat(np.arange(len(chord_table)) * bar_ms,
+                                  [len(chord) for chord in chord_table])
+            lengths_ms = np.full(len(freqs), int(chord_duration * 1000))
+            
+            cycle = self._render_sine_notes(freqs, starts_ms, lengths_ms,
+                                            np.ones(len(freqs)), cycle_ms, frame_rate)
+            # As generate_chord, the tones saturate as they sum and the chord
+            # then sits 6dB down
+            return self._render_sequence([(0, cycle, -6)], timing.total_ms, frame_rate,
+                                         cycle_ms=cycle_ms)
         
-        # Repeat progression for all bars
-        repeats = bars // len(progression)
-        if bars % len(progression) != 0:
-            repeats += 1
+        events = []
         
-        for _ in range(repeats):
-            for root, chord_type in progression:
-                # Get chord frequencies
-                freqs = self.theory.get_chord(root, chord_type, octave=3)
-                
+        # Each distinct chord is rendered once, as a single segment at the
+        # output rate, and reused wherever the progression repeats it
+        chord_cache: Dict[Tuple, AudioSegment] = {}
+        
+        # One chord per bar for one pass of the progression
+        for bar, (root, chord_type) in enumerate(progression):
+            
+            # Get chord frequencies
+            freqs = self.theory.get_chord(root, chord_type, octave=3)
+            key = (voicing, tuple(int(f) for f in freqs), round(chord_duration, 3))
+            
+            chord = chord_cache.get(key)
+            if chord is None:
                 # Choose generation method based on voicing
                 if voicing == 'piano':
-                    # Use piano sound
-                    chord = AudioSegment.silent(duration=0)
-                    for freq in freqs:
-                        note = self.generator.generate_piano(
+                    # Use piano sound, one note per chord tone
+                    notes = [
+                        self.generator.generate_piano(
                             int(freq), 
                             duration=chord_duration,
                             velocity=0.7
                         )
-                        chord = chord.overlay(note)
-                elif voicing == 'pad':
+                        for freq in freqs
+                    ]
+                else:
                     # Use ambient pad
-                    chord = AudioSegment.silent(duration=0)
-                    for freq in freqs:
-                        pad = self.generator.generate_pad(
+                    notes = [
+                        self.generator.generate_pad(
                             int(freq),
                             duration=chord_duration,
                             brightness=0.5
                         )
-                        chord = chord.overlay(pad)
-                else:
-                    # Use standard synth chord
-                    chord = self.generator.generate_chord(
-                        [int(f) for f in freqs], 
-                        duration=chord_duration
-                    )
+                        for freq in freqs
+                    ]
                 
-                chords_audio = chords_audio + chord
+                chord = self._render_sequence(
+                    [(0, note, 0) for note in notes], bar_ms, frame_rate
+                )
+                chord_cache[key] = chord
+            
+            events.append((bar * bar_ms, chord, 0))
         
-        # Trim to exact length
-        total_duration = beat_ms * 4 * bars
-        return chords_audio[:total_duration]
+        # Repeat the rendered pass for all bars
+        return self._render_sequence(events, timing.total_ms, frame_rate,
+                                     cycle_ms=cycle_ms)
     
-    def _generate_melody(self, key: str, scale: str, bpm: int, bars: int,
+    def _generate_melody(self, key: str, scale: str, timing: TrackTiming,
                         preset: Dict) -> AudioSegment:
         """Generate melody with intelligent variations"""
-        # Get scale notes
+        # Scale notes over three octaves for range
         octave = preset.get('melody_octave', 5)
-        scale_notes = self.theory.get_scale_notes(key, scale, octave)
-        
-        # Extend scale to multiple octaves for range
-        scale_notes_extended = []
-        for octave_shift in [-1, 0, 1]:
-            for note_name, freq in scale_notes:
-                shifted_freq = freq * (2 ** octave_shift)
-                scale_notes_extended.append((note_name, shifted_freq))
+        names, freqs = _extended_scale(key, scale, octave)
         
         # Generate intelligent melodic contour
         notes_per_bar = 8  # Eighth notes
-        total_notes = bars * notes_per_bar
+        total_notes = timing.bars * notes_per_bar
         
         melody_style = preset.get('melody_style', 'smooth')
         
         # Use variation engine for intelligent contour
-        key_center = len(scale_notes)  # Middle octave
+        key_center = len(names) // 3  # Middle octave
         melody_indices = self.variation_engine.generate_melodic_contour(
-            scale_notes_extended,
+            names,
             total_notes,
             melody_style,
             key_center
@@ -427,81 +651,207 @@ class AutoComposer:
         )
         
         # Generate audio with premium quality
-        beat_ms = int(60000 / bpm)
-        note_duration = (beat_ms / 2) / 1000  # Eighth note in seconds
-        
-        melody_audio = AudioSegment.silent(duration=0)
-        
-        for i, note_idx in enumerate(melody_indices):
-            if note_idx >= len(scale_notes_extended):
-                note_idx = len(scale_notes_extended) - 1
-            
-            note_name, freq = scale_notes_extended[note_idx]
-            
-            # Intelligent duration variation (not random)
-            if i % 4 == 3:  # Longer notes at phrase ends
-                duration = note_duration * 1.5
-            elif i % 2 == 1:  # Slightly shorter on off-beats
-                duration = note_duration * 0.9
-            else:
-                duration = note_duration
-            
-            # Use piano for certain genres, synth for others
-            voicing = preset.get('chord_voicing', 'synth')
-            variation_amount = random.uniform(0.3, 0.7)  # Humanization
-            
-            if voicing == 'piano':
-                note = self.generator.generate_piano(
-                    int(freq), 
-                    duration, 
-                    velocity=velocities[i],
-                    variation=variation_amount
-                )
-            else:
-                note = self.generator.generate_synth(
-                    duration, 
-                    int(freq), 
-                    'sine'
-                )
-                # Apply velocity
-                note = note - (20 * (1 - velocities[i]))
+        note_duration = (timing.beat_ms / 2) / 1000  # Eighth note in seconds
+        
+        # Per-note timing and dynamics, all notes at once
+        i = np.arange(total_notes)
+        # Longer notes at phrase ends, slightly shorter on off-beats
+        durations = note_duration * np.where(i % 4 == 3, 1.5, np.where(i % 2 == 1, 0.9, 1.0))
+        # Legato on strong beats, more staccato otherwise
+        gap_ratios = np.where(i % 4 == 0, 0.05, 0.15)
+        vel_db = 20 * (1 - np.asarray(velocities, dtype=np.float64))
+        
+        # Keep contour indices inside the extended scale, then gather every
+        # note frequency in one step
+        melody_indices = np.clip(np.asarray(melody_indices, dtype=np.int32), 0, len(freqs) - 1)
+        note_freqs = freqs[melody_indices].astype(int)
+        
+        # Use piano for certain genres, synth for others
+        voicing = preset.get('chord_voicing', 'synth')
+        frame_rate = self.generator.sample_rate
+        
+        if voicing != 'piano':
+            # Plain sine notes: render the whole line in one pass, velocity
+            # applied as a per-note gain
+            note_ms = (durations * 1000).astype(np.int64)
+            gaps = np.maximum((note_duration * 1000 - note_ms
+                               + note_duration * 1000 * gap_ratios).astype(np.int64), 0)
+            starts_ms = np.concatenate(([0], np.cumsum(note_ms + gaps)[:-1]))
+            return self._render_sine_notes(note_freqs, starts_ms, note_ms,
+                                           10 ** (-vel_db / 20),
+                                           int(note_ms.sum() + gaps.sum()), frame_rate)
+        
+        # Humanization, drawn for every note at once
+        variation_amounts = np.random.uniform(0.3, 0.7, total_notes)
+        
+        events = []
+        pos = 0
+        for i in range(total_notes):
+            note = self.generator.generate_piano(
+                note_freqs[i], 
+                durations[i], 
+                velocity=velocities[i],
+                variation=variation_amounts[i]
+            )
+            events.append((pos, note, 0))
             
             # Intelligent gap (articulation)
-            if i % 4 == 0:  # Legato on strong beats
-                gap_ratio = 0.05
-            else:  # More staccato otherwise
-                gap_ratio = 0.15
-            
-            gap = int((note_duration * 1000) - len(note) + (note_duration * 1000 * gap_ratio))
-            if gap > 0:
-                note = note + AudioSegment.silent(duration=gap)
-            
-            melody_audio = melody_audio + note
+            gap = int((note_duration * 1000) - len(note) + (note_duration * 1000 * gap_ratios[i]))
+            pos += len(note) + max(gap, 0)
+        
+        return self._render_sequence(events, pos, frame_rate)
+    
+    def _render_sine_notes(self, freqs: np.ndarray, starts_ms: np.ndarray,
+                           lengths_ms: np.ndarray, gains: np.ndarray,
+                           total_ms: float, frame_rate: int) -> AudioSegment:
+        """
+        Render sine notes shaped like SoundGenerator.generate_synth - linear
+        fade in over a tenth of the note (at most 50ms) and out over a fifth
+        (at most 100ms) - straight into one buffer at frame_rate
         
-        return melody_audio
+        Returns:
+            16-bit mono AudioSegment of total_ms
+        """
+        to_frames = lambda ms: (np.asarray(ms) * frame_rate // 1000).astype(np.int64)
+        freqs = np.ascontiguousarray(freqs, dtype=np.float64)
+        gains = np.ascontiguousarray(gains, dtype=np.float64)
+        starts = to_frames(starts_ms)
+        lengths = to_frames(lengths_ms)
+        attacks = to_frames(np.minimum(50, lengths_ms // 10))
+        releases = to_frames(np.minimum(100, lengths_ms // 5))
+        
+        mix = np.zeros((int(total_ms * frame_rate / 1000), 1), dtype=np.float32)
+        if _audio_kernels.NUMBA_AVAILABLE:
+            _audio_kernels.render_sines(mix, freqs, starts, lengths, attacks,
+                                        releases, gains, frame_rate)
+        else:
+            total = len(mix)
+            for k in range(len(freqs)):
+                if starts[k] >= total:
+                    continue
+                j = np.arange(min(lengths[k], total - starts[k]))
+                env = np.ones(len(j))
+                env[:attacks[k]] = j[:attacks[k]] / max(attacks[k], 1)
+                tail = lengths[k] - releases[k]
+                env[tail:] = (lengths[k] - j[tail:]) / max(releases[k], 1)
+                note = 32767.0 * gains[k] * env * np.sin(2 * np.pi * freqs[k] / frame_rate * j)
+                mix[starts[k]:starts[k] + len(j), 0] += note
+        
+        return self._mix_to_segment(mix, frame_rate)
     
     def _apply_genre_effects(self, track: AudioSegment, genre: str) -> AudioSegment:
         """Apply genre-specific processing"""
-        # Normalize first
+        # Normalize first (applied in the same pass as the EQ below)
         target_dBFS = -14.0
-        change_in_dBFS = target_dBFS - track.dBFS
-        track = track.apply_gain(change_in_dBFS)
+        change_in_dBFS = target_dBFS - track.dBFS if track.rms else 0.0
         
         # Genre-specific EQ and character
         if genre == 'lofi':
             # Lo-fi character: reduce highs, add warmth
-            track = track.low_pass_filter(8000)
-            track = track.high_pass_filter(80)
+            track = self._apply_filters(track, hp=80, lp=8000, gain_db=change_in_dBFS)
         
         elif genre in ['electro', 'synthwave']:
             # Crisp and bright
-            track = track.high_pass_filter(40)
+            track = self._apply_filters(track, hp=40, gain_db=change_in_dBFS)
         
         elif genre == 'relax':
             # Warm and smooth
-            track = track.low_pass_filter(10000)
+            track = self._apply_filters(track, lp=10000, gain_db=change_in_dBFS)
         
-        return track
+        else:
+            track = self._apply_filters(track, gain_db=change_in_dBFS)
+        
+        return self._to_output_rate(track)
+    
+    def _to_output_rate(self, track: AudioSegment) -> AudioSegment:
+        """Resample a finished track from the synthesis rate to the output rate"""
+        if track.frame_rate == self.output_rate:
+            return track
+        
+        g = gcd(self.output_rate, track.frame_rate)
+        samples = np.frombuffer(track.raw_data, dtype=np.int16).reshape(-1, track.channels)
+        resampled = signal.resample_poly(samples.astype(np.float32), self.output_rate // g,
+                                         track.frame_rate // g, axis=0)
+        np.clip(resampled, -32768, 32767, out=resampled)
+        
+        return AudioSegment(
+            resampled.astype(np.int16).tobytes(),
+            frame_rate=self.output_rate,
+            sample_width=2,
+            channels=track.channels
+        )
+    
+    @staticmethod
+    def _fade_out(track: AudioSegment, fraction: float) -> AudioSegment:
+        """
+        Fade out the last fraction of a track with one per-sample linear
+        gain ramp (pydub's fade_out steps the gain once per millisecond)
+        """
+        samples = np.frombuffer(track.raw_data, dtype=np.int16).reshape(-1, track.channels)
+        fade_n = int(len(samples) * fraction)
+        if fade_n == 0:
+            return track
+        
+        out = samples.astype(np.float32)
+        out[-fade_n:] *= np.linspace(1.0, 0.0, fade_n, endpoint=False, dtype=np.float32)[:, None]
+        
+        return track._spawn(out.astype(np.int16).tobytes())
+    
+    @staticmethod
+    def _apply_filters(track: AudioSegment, hp: Optional[float] = None,
+                       lp: Optional[float] = None, gain_db: float = 0.0) -> AudioSegment:
+        """
+        Gain, low-pass and/or high-pass a track in a single pass over its PCM
+        
+        Each filter is the same one-pole RC filter as pydub's
+        low_pass_filter/high_pass_filter (6 dB per octave), started on the
+        first sample the same way, so the result matches pydub's
+        low-pass-then-high-pass chain without its per-sample Python loop.
+        The filters are linear, so the gain is folded into the first
+        section's coefficients instead of costing a pass of its own.
+        
+        Args:
+            track: 16-bit track to filter
+            hp: High-pass cutoff in Hz (None to skip)
+            lp: Low-pass cutoff in Hz (None to skip)
+            gain_db: Gain to apply in dB
+        
+        Returns:
+            Processed track, clipped once to 16-bit
+        """
+        dt = 1.0 / track.frame_rate
+        sections = []
+        if lp is not None:
+            rc = 1.0 / (lp * 2 * np.pi)
+            alpha = dt / (rc + dt)
+            sections.append([alpha, 0.0, 0.0, 1.0, alpha - 1.0, 0.0])
+        if hp is not None:
+            rc = 1.0 / (hp * 2 * np.pi)
+            alpha = rc / (rc + dt)
+            sections.append([alpha, -alpha, 0.0, 1.0, -alpha, 0.0])
+        if not sections and not gain_db:
+            return track
+        
+        samples = np.frombuffer(track.raw_data, dtype=np.int16).reshape(-1, track.channels)
+        if len(samples) == 0:
+            return track
+        gain = 10 ** (gain_db / 20)
+        
+        if not sections:
+            filtered = samples * np.float32(gain)
+        else:
+            sos = np.array(sections)
+            
+            # Every section passes the (gained) first sample through unchanged
+            zi = np.zeros((len(sos), 2, track.channels))
+            for k, (b0, _, _, _, _, _) in enumerate(sos):
+                zi[k, 0] = (1.0 - b0) * gain * samples[0]
+            sos[0, :3] *= gain
+            
+            filtered, _ = signal.sosfilt(sos, samples, axis=0, zi=zi)
+        np.clip(filtered, -32768, 32767, out=filtered)
+        
+        return track._spawn(filtered.astype(np.int16).tobytes())
     
     def compose_section(self, genre: str, section_type: str, 
                        duration_bars: int = 4, key: str = 'C') -> AudioSegment:
@@ -546,32 +896,32 @@ class AutoComposer:
     
     def _compose_intro(self, genre: str, bars: int, key: str, preset: Dict) -> AudioSegment:
         """Compose intro section"""
-        bpm = self.theory.get_bpm_for_genre(genre)
+        timing = TrackTiming.for_tempo(self.theory.get_bpm_for_genre(genre), bars)
         progression = self.theory.get_progression(key, preset['progression_style'])
         
-        chords = self._generate_chords(progression, bpm, bars, preset)
-        melody = self._generate_melody(key, preset['scale'], bpm, bars, preset)
+        chords = self._generate_chords(progression, timing, preset)
+        melody = self._generate_melody(key, preset['scale'], timing, preset)
         
-        intro = chords.overlay(melody - 3)
+        intro = self._mix_stems([(chords, 0), (melody, -3)])
         return self._apply_genre_effects(intro, genre)
     
     def _compose_break(self, genre: str, bars: int, key: str, preset: Dict) -> AudioSegment:
         """Compose break section"""
-        bpm = self.theory.get_bpm_for_genre(genre)
+        timing = TrackTiming.for_tempo(self.theory.get_bpm_for_genre(genre), bars)
         progression = self.theory.get_progression(key, preset['progression_style'])
         
-        drums = self._generate_drums(bpm, bars, preset)
-        bass = self._generate_bass(progression, bpm, bars, preset)
+        drums = self._generate_drums(timing, preset)
+        bass = self._generate_bass(progression, timing, preset)
         
-        break_section = drums.overlay(bass - 3)
+        break_section = self._mix_stems([(drums, 0), (bass, -3)])
         return self._apply_genre_effects(break_section, genre)
     
     def _compose_outro(self, genre: str, bars: int, key: str, preset: Dict) -> AudioSegment:
         """Compose outro section"""
-        bpm = self.theory.get_bpm_for_genre(genre)
+        timing = TrackTiming.for_tempo(self.theory.get_bpm_for_genre(genre), bars)
         progression = self.theory.get_progression(key, preset['progression_style'])
         
-        chords = self._generate_chords(progression, bpm, bars, preset)
-        chords = chords.fade_out(int(len(chords) * 0.8))
+        chords = self._generate_chords(progression, timing, preset)
+        chords = self._fade_out(chords, 0.8)
         
         return self._apply_genre_effects(chords, genre)
@@ -5,15 +5,57 @@ Continuous Generator - Generate evolving, continuous music
 from pydub import AudioSegment
 from src.composer import AutoComposer
 from src.music_theory import MusicTheory
+from concurrent.futures import ProcessPoolExecutor
+import os
 import random
-from typing import List, Dict, Optional
+from typing import Any, Callable, Iterator, List, Dict, Optional, Tuple
+import wave
+import numpy as np
+
+
+def _run_seeded(seed: int, fn: Callable, *args: Any) -> Any:
+    """
+    Run fn(*args) in a pool worker with both RNGs reseeded - forked workers
+    would otherwise all inherit the same random state and compose the same
+    track
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    return fn(*args)
+
+
+def _match_format(section: AudioSegment, like: AudioSegment) -> AudioSegment:
+    """
+    Convert section to the frame rate, channel count and sample width of
+    like, so their raw PCM can be joined byte for byte
+    """
+    if section.frame_rate != like.frame_rate:
+        section = section.set_frame_rate(like.frame_rate)
+    if section.channels != like.channels:
+        section = section.set_channels(like.channels)
+    if section.sample_width != like.sample_width:
+        section = section.set_sample_width(like.sample_width)
+    return section
+
+
+def _continuous_job(genre: str, total_bars: int, key: str) -> AudioSegment:
+    """
+    Pool worker for generate_mixtape - builds its own generator in the child,
+    so only plain arguments and the finished AudioSegment cross processes
+    """
+    return ContinuousGenerator().generate_continuous(genre, total_bars, key)
+
+
+def _compose_track_job(genre: str, bars: int, key: str) -> AudioSegment:
+    """Pool worker for generate_variations, with a composer built in the child"""
+    return AutoComposer(premium=True).compose_track(genre, bars, key)
 
 
 class ContinuousGenerator:
     """Generate continuous, evolving music tracks"""
     
     def __init__(self):
-        self.composer = AutoComposer()
+        self.composer = AutoComposer(premium=True)
         self.theory = MusicTheory()
     
     def generate_continuous(self, genre: str, total_bars: int = 64,
@@ -40,14 +82,25 @@ class ContinuousGenerator:
         else:
             structure = self._parse_structure(structure, total_bars)
         
-        # Generate sections
-        track = AudioSegment.silent(duration=0)
+        # Generate sections - a section repeated in the structure (a second
+        # verse or chorus of the same length) is composed once and reused
+        sections: Dict[Tuple[str, int], AudioSegment] = {}
+        track = []
         
         for section_type, bars in structure:
-            section = self.composer.compose_section(genre, section_type, bars, key)
-            track = track + section
+            section = sections.get((section_type, bars))
+            if section is None:
+                section = self.composer.compose_section(genre, section_type, bars, key)
+                sections[(section_type, bars)] = section
+            track.append(section)
+        
+        if not track:
+            return AudioSegment.silent(duration=0)
         
-        return track
+        # Join the PCM once instead of re-copying the track per section
+        first = track[0]
+        return first._spawn(b''.join(_match_format(section, first).raw_data
+                                     for section in track))
     
     def _get_default_structure(self, total_bars: int) -> List[tuple]:
         """
@@ -157,24 +210,59 @@ class ContinuousGenerator:
         Returns:
             Complete mixtape
         """
-        mixtape = AudioSegment.silent(duration=0)
+        # Random key for each section, then compose every genre at once
+        jobs = [(genre, bars_per_genre, random.choice(['C', 'D', 'E', 'F', 'G', 'A']))
+                for genre in genres]
+        sections = self._map_parallel(self.generate_continuous, _continuous_job, jobs)
         
-        for i, genre in enumerate(genres):
-            # Random key for each section
-            key = random.choice(['C', 'D', 'E', 'F', 'G', 'A'])
-            
-            # Generate section
-            section = self.generate_continuous(genre, bars_per_genre, key)
-            
-            # Add transition
-            if transitions and i > 0:
-                # Crossfade between genres
-                crossfade_ms = 2000
-                mixtape = mixtape.append(section, crossfade=crossfade_ms)
-            else:
-                mixtape = mixtape + section
-        
-        return mixtape
+        # Crossfade between genres
+        crossfade_ms = 2000 if transitions else 0
+        return self._crossfade_join(sections, crossfade_ms)
+    
+    @staticmethod
+    def _crossfade_join(sections: List[AudioSegment], crossfade_ms: int) -> AudioSegment:
+        """
+        Join sections into one preallocated buffer, each overlapping the end
+        of the previous one with a linear crossfade, as AudioSegment.append
+        
+        Args:
+            sections: Sections to join, in order
+            crossfade_ms: Overlap between neighbours (0 for a plain join)
+        
+        Returns:
+            Joined AudioSegment in the format of the first section
+        """
+        if not sections:
+            return AudioSegment.silent(duration=0)
+        
+        first = sections[0]
+        arrays = []
+        for section in sections:
+            section = _match_format(section, first)
+            arrays.append(np.frombuffer(section.raw_data, dtype=np.int16)
+                          .reshape(-1, first.channels))
+        
+        # Each overlap is capped by the audio on both sides of it
+        xf = int(crossfade_ms * first.frame_rate / 1000)
+        overlaps = [0]
+        end = len(arrays[0])
+        for samples in arrays[1:]:
+            overlaps.append(min(xf, end, len(samples)))
+            end += len(samples) - overlaps[-1]
+        
+        out = np.zeros((end, first.channels), dtype=np.float32)
+        cursor = 0
+        for samples, overlap in zip(arrays, overlaps):
+            start = cursor - overlap
+            if overlap:
+                ramp = np.linspace(0, 1, overlap, endpoint=False, dtype=np.float32)[:, None]
+                out[start:cursor] *= 1 - ramp
+                out[start:cursor] += samples[:overlap] * ramp
+            out[cursor:start + len(samples)] = samples[overlap:]
+            cursor = start + len(samples)
+        
+        np.clip(out, -32768, 32767, out=out)
+        return first._spawn(out.astype(np.int16).tobytes())
     
     def generate_variations(self, genre: str, bars: int, 
                            count: int = 3, key: str = 'C') -> List[AudioSegment]:
@@ -190,13 +278,34 @@ class ContinuousGenerator:
         Returns:
             List of track variations
         """
-        variations = []
+        return self._map_parallel(self.composer.compose_track, _compose_track_job,
+                                  [(genre, bars, key)] * count)
+    
+    @staticmethod
+    def _map_parallel(fn: Callable, worker: Callable, jobs: List[tuple]) -> List[Any]:
+        """
+        Run every args tuple in jobs across a process pool
+        
+        Args:
+            fn: Bound method used when running in-process
+            worker: Module-level equivalent of fn for the pool - it must
+                    take only picklable arguments, since the generator and
+                    its composer are not sent to the workers
+            jobs: Argument tuples, one per result
         
-        for _ in range(count):
-            track = self.composer.compose_track(genre, bars, key)
-            variations.append(track)
+        Returns:
+            Results in job order (run in-process when only one CPU is available)
+        """
+        workers = min(len(jobs), os.cpu_count() or 1)
+        if workers <= 1:
+            return [fn(*args) for args in jobs]
         
-        return variations
+        # Seeds come from this process's RNG so a seeded run stays reproducible
+        seeds = [random.getrandbits(32) for _ in jobs]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_seeded, seed, worker, *args)
+                       for seed, args in zip(seeds, jobs)]
+            return [future.result() for future in futures]
 
 
 class InfiniteGenerator:
@@ -211,33 +320,90 @@ class InfiniteGenerator:
         self.variation = variation
         self.section_types = ['verse', 'chorus', 'break', 'verse', 'chorus']
         self.current_section = 0
+        
+        # Sections composed during the current pass over section_types, keyed
+        # by (section_type, key) - every pass composes fresh material
+        self._sections: Dict[Tuple[str, str], AudioSegment] = {}
     
     def next_section(self) -> AudioSegment:
         """Generate next section in the infinite stream"""
         # Get next section type
-        section_type = self.section_types[self.current_section % len(self.section_types)]
+        position = self.current_section % len(self.section_types)
+        section_type = self.section_types[position]
         self.current_section += 1
         
+        # A new pass through the structure starts from new material
+        if position == 0:
+            self._sections.clear()
+        
         # Add variation
         if self.variation == 'high':
             # Change key occasionally
             if random.random() < 0.3:
                 self.key = random.choice(['C', 'D', 'E', 'F', 'G', 'A'])
         
-        # Generate section
-        return self.composer.compose_section(
-            self.genre, section_type, self.bars_per_section, self.key
-        )
+        # Generate section, or repeat the one already composed for it in
+        # this pass
+        cache_key = (section_type, self.key)
+        section = self._sections.get(cache_key)
+        if section is None:
+            section = self.composer.compose_section(
+                self.genre, section_type, self.bars_per_section, self.key
+            )
+            self._sections[cache_key] = section
+        return section
     
-    def generate_stream(self, total_bars: int) -> AudioSegment:
-        """Generate a stream of given length"""
-        stream = AudioSegment.silent(duration=0)
+    def iter_sections(self, total_bars: int) -> Iterator[AudioSegment]:
+        """Yield sections of the stream until total_bars have been generated"""
         bars_generated = 0
         
         while bars_generated < total_bars:
-            section = self.next_section()
-            stream = stream + section
+            yield self.next_section()
             bars_generated += self.bars_per_section
+    
+    def generate_stream(self, total_bars: int) -> AudioSegment:
+        """Generate a stream of given length"""
+        sections = list(self.iter_sections(total_bars))
+        if not sections:
+            return AudioSegment.silent(duration=0)
+        
+        # Join the PCM once instead of re-copying the stream per section
+        first = sections[0]
+        return first._spawn(b''.join(_match_format(section, first).raw_data
+                                     for section in sections))
+    
+    def stream_to_file(self, path: str, total_bars: int) -> str:
+        """
+        Write a stream of given length straight to a WAV file, one section
+        at a time
+        
+        Sections are written as they are composed rather than joined in
+        memory; only the sections of the current pass over section_types
+        (up to five) are kept for repeats
+        
+        Args:
+            path: Output WAV file path
+            total_bars: Length of the stream in bars (a valid empty WAV is
+                        written when it is 0 or less)
+        
+        Returns:
+            Output file path
+        """
+        with wave.open(path, 'wb') as wf:
+            # Header format of the composer's 16-bit mono output; replaced
+            # by the first section's own format once there is one
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(self.composer.output_rate)
+            
+            first = None
+            for section in self.iter_sections(total_bars):
+                if first is None:
+                    first = section
+                    wf.setnchannels(first.channels)
+                    wf.setsampwidth(first.sample_width)
+                    wf.setframerate(first.frame_rate)
+                # Header sizes are patched once on close, not per section
+                wf.writeframesraw(_match_format(section, first).raw_data)
         
-        # Trim to exact length if needed
-        return stream
+        return path
@@ -12,6 +12,35 @@ import numpy as np
 import tempfile
 import os
 
+# JIT-compiled bitcrusher
+try:
+    from numba import njit, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(types.void(types.Array(types.int16, 1, 'C'), types.int64),
+          cache=True, nogil=True)
+    def _bitcrush(samples, shift):
+        """
+        Quantize 16-bit samples in place to multiples of 2**shift, rounding
+        to the nearest step (ties to even, as np.round), in one pass
+        """
+        half = (1 << shift) >> 1
+        low = (1 << shift) - 1
+        for i in range(samples.shape[0]):
+            x = np.int32(samples[i])
+            q = (x + half) >> shift
+            if shift and (x & low) == half and (q & 1):
+                q -= 1
+            x = q << shift
+            # Rounding the loudest samples up can step past full scale
+            if x > 32767:
+                x = 32767
+            samples[i] = x
+
 
 class EffectsProcessor:
     """Apply various audio effects to audio files - Premium quality"""
@@ -70,12 +99,15 @@ class EffectsProcessor:
             audio = f.read(f.frames)
             sample_rate = f.samplerate
         
-        # Process with pedalboard
+        # Process with pedalboard - the returned buffer is ours, so the rest
+        # of the chain works on it in place
         effected = board(audio, sample_rate)
         
         # Mix dry and wet signals
         if mix < 1.0:
-            effected = (1 - mix) * audio + mix * effected
+            effected *= mix
+            audio *= 1 - mix
+            effected += audio
         
         # Convert back to AudioSegment
         return self._array_to_audiosegment(effected, sample_rate)
@@ -86,33 +118,18 @@ class EffectsProcessor:
         if audio_array.ndim == 1:
             audio_array = audio_array.reshape(1, -1)
         
-        # Normalize and convert to int16
-        audio_array = audio_array.T  # Transpose to (samples, channels)
-        audio_array = np.clip(audio_array, -1.0, 1.0)
-        audio_int16 = (audio_array * 32767).astype(np.int16)
-        
-        # Create temporary WAV file
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
-            tmp_path = tmp.name
+        # Normalize and convert to int16, interleaved as (samples, channels)
+        audio_array = np.clip(audio_array.T, -1.0, 1.0, out=audio_array.T)
+        audio_array *= 32767
+        audio_int16 = np.ascontiguousarray(audio_array, dtype=np.int16)
         
-        try:
-            # Write to temporary file
-            channels = audio_int16.shape[1] if audio_int16.ndim > 1 else 1
-            audio_segment = AudioSegment(
-                audio_int16.tobytes(),
-                frame_rate=sample_rate,
-                sample_width=2,
-                channels=channels
-            )
-            audio_segment.export(tmp_path, format='wav')
-            
-            # Read back as AudioSegment
-            result = AudioSegment.from_wav(tmp_path)
-            return result
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        # Wrap the PCM directly - no WAV encode/decode round trip
+        return AudioSegment(
+            audio_int16.tobytes(),
+            frame_rate=sample_rate,
+            sample_width=2,
+            channels=audio_int16.shape[1]
+        )
     
     def _apply_reverb(self, input_file: str, mix: float, intensity: float) -> AudioSegment:
         """Apply reverb effect"""
@@ -194,20 +211,28 @@ class EffectsProcessor:
     
     def _apply_bitcrush(self, input_file: str, intensity: float) -> AudioSegment:
         """Apply bitcrush effect (lo-fi)"""
-        # Load audio
+        # Load audio as 16-bit, the scale the bit depths below refer to
         audio = AudioSegment.from_file(input_file)
-        
-        # Convert to numpy array
-        samples = np.array(audio.get_array_of_samples())
+        if audio.sample_width != 2:
+            audio = audio.set_sample_width(2)
         
         # Map intensity to bit depth (lower intensity = more crushing)
         # intensity 0.0 = 4 bits, 1.0 = 16 bits
         bit_depth = int(4 + (intensity * 12))
         
-        # Reduce bit depth
-        max_val = 2 ** bit_depth
-        samples = np.round(samples / (32768 / max_val)) * (32768 / max_val)
-        samples = np.clip(samples, -32768, 32767).astype(np.int16)
+        # Reduce bit depth - a bit depth of b keeps steps of
+        # 32768 / 2**b = 2**(15 - b)
+        shift = max(15 - bit_depth, 0)
+        samples = np.frombuffer(audio.raw_data, dtype=np.int16)
+        if NUMBA_AVAILABLE:
+            samples = samples.copy()
+            _bitcrush(samples, shift)
+        elif shift:
+            # Same integer rounding as the kernel, a whole array at a time
+            x = samples.astype(np.int32)
+            q = (x + (1 << (shift - 1))) >> shift
+            q -= ((x & ((1 << shift) - 1)) == (1 << (shift - 1))) & (q & 1)
+            samples = np.minimum(q << shift, 32767).astype(np.int16)
         
         # Create new AudioSegment
         return AudioSegment(
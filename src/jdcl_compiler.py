@@ -16,12 +16,17 @@ from src.audio_humanizer import AudioHumanizer
 from src.silence_filler import SilenceFiller
 from src.advanced_mastering import AdvancedMasteringChain
 import random
+import re
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 import os
 import tempfile
 
 
+# Note strings such as 'C4' or 'F#3'
+_NOTE_RE = re.compile(r'([A-G]#?)(\d+)')
+
+
 class JDCLCompiler:
     """
     Intelligent JDCL Compiler with Quality Analysis & Regeneration
@@ -53,6 +58,9 @@ class JDCLCompiler:
         # Cache for generated sounds
         self.sound_cache: Dict[str, AudioSegment] = {}
         
+        # Cache for note frequencies, keyed by note string ('C4', 'F#3', ...)
+        self._note_freqs: Dict[str, float] = {}
+        
         # Quality settings (STRICTER STANDARDS!)
         self.max_regeneration_attempts = 5  # More chances (was 3)
         self.enable_auto_fix = True
@@ -521,15 +529,21 @@ class JDCLCompiler:
     
     def _note_to_frequency(self, note_str: str) -> float:
         """Convert note string to frequency (e.g., 'C4' -> 261.63)"""
+        frequency = self._note_freqs.get(note_str)
+        if frequency is not None:
+            return frequency
+        
         # Parse note string
-        match = re.match(r'([A-G]#?)(\d+)', note_str)
+        match = _NOTE_RE.match(note_str)
         if not match:
-            return 440.0  # Default A4
-        
-        note_name = match.group(1)
-        octave = int(match.group(2))
+            frequency = 440.0  # Default A4
+        else:
+            note_name = match.group(1)
+            octave = int(match.group(2))
+            frequency = self.theory.note_to_freq(note_name, octave)
         
-        return self.theory.note_to_freq(note_name, octave)
+        self._note_freqs[note_str] = frequency
+        return frequency
     
     def _apply_effects(self, audio: AudioSegment, 
                       effects_config: Dict) -> AudioSegment:
@@ -623,8 +637,8 @@ class JDCLCompiler:
                 print(f"    • Applying dynamic range compression...")
             
             # Gentle compression
-            samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
-            samples = samples / (2**15)
+            samples = np.frombuffer(audio.raw_data, dtype=np.int16)
+            samples = np.multiply(samples, np.float32(1.0 / 2**15), dtype=np.float32)
             
             # Simple soft knee compression
             threshold = 0.6
@@ -645,7 +659,3 @@ class JDCLCompiler:
             )
         
         return audio
-
-
-import re  # Add at top with other imports
-
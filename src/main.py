@@ -294,7 +294,7 @@ def compose(
     console.print(f"[dim]Length: {bars} bars | Style: {genre}[/dim]\n")
     
     try:
-        composer = AutoComposer()
+        composer = AutoComposer(premium=True)
         
         with console.status("[bold cyan]Composing track..."):
             track = composer.compose_track(genre, bars, key)
@@ -2,6 +2,7 @@
 Music Theory - Scales, chords, progressions, and musical structures
 """
 
+import functools
 import random
 from typing import List, Dict, Tuple
 import numpy as np
@@ -28,6 +29,21 @@ class MusicTheory:
         'melodic_minor': [0, 2, 3, 5, 7, 9, 11],
     }
     
+    # Chord intervals (in semitones from root)
+    CHORD_PATTERNS = {
+        'major': [0, 4, 7],
+        'minor': [0, 3, 7],
+        'dim': [0, 3, 6],
+        'aug': [0, 4, 8],
+        'sus2': [0, 2, 7],
+        'sus4': [0, 5, 7],
+        'maj7': [0, 4, 7, 11],
+        'min7': [0, 3, 7, 10],
+        'dom7': [0, 4, 7, 10],
+        'maj9': [0, 4, 7, 11, 14],
+        'min9': [0, 3, 7, 10, 14],
+    }
+    
     # Common chord progressions by genre
     PROGRESSIONS = {
         'pop': [
@@ -75,18 +91,7 @@ class MusicTheory:
         Returns:
             Frequency in Hz
         """
-        if note not in self.NOTE_NAMES:
-            raise ValueError(f"Invalid note: {note}")
-        
-        # Calculate semitones from A4
-        note_index = self.NOTE_NAMES.index(note)
-        a_index = self.NOTE_NAMES.index('A')
-        
-        # Semitones from A4
-        semitones = (octave - 4) * 12 + (note_index - a_index)
-        
-        # Calculate frequency
-        return self.base_freq * (2 ** (semitones / 12))
+        return _note_freq(note, octave, self.base_freq)
     
     def get_scale_notes(self, root: str, scale_type: str = 'major', 
                         octave: int = 4) -> List[Tuple[str, float]]:
@@ -101,25 +106,7 @@ class MusicTheory:
         Returns:
             List of (note_name, frequency) tuples
         """
-        if scale_type not in self.SCALES:
-            raise ValueError(f"Unknown scale type: {scale_type}")
-        
-        root_index = self.NOTE_NAMES.index(root)
-        pattern = self.SCALES[scale_type]
-        
-        notes = []
-        for interval in pattern:
-            note_index = (root_index + interval) % 12
-            note_name = self.NOTE_NAMES[note_index]
-            
-            # Calculate octave adjustment
-            octave_adjust = (root_index + interval) // 12
-            note_octave = octave + octave_adjust
-            
-            freq = self.note_to_freq(note_name, note_octave)
-            notes.append((note_name, freq))
-        
-        return notes
+        return list(_scale_notes(root, scale_type, octave, self.base_freq))
     
     def get_chord(self, root: str, chord_type: str = 'major', 
                   octave: int = 3) -> List[float]:
@@ -134,37 +121,7 @@ class MusicTheory:
         Returns:
             List of frequencies
         """
-        root_index = self.NOTE_NAMES.index(root)
-        
-        # Chord intervals (in semitones from root)
-        chord_patterns = {
-            'major': [0, 4, 7],
-            'minor': [0, 3, 7],
-            'dim': [0, 3, 6],
-            'aug': [0, 4, 8],
-            'sus2': [0, 2, 7],
-            'sus4': [0, 5, 7],
-            'maj7': [0, 4, 7, 11],
-            'min7': [0, 3, 7, 10],
-            'dom7': [0, 4, 7, 10],
-            'maj9': [0, 4, 7, 11, 14],
-            'min9': [0, 3, 7, 10, 14],
-        }
-        
-        if chord_type not in chord_patterns:
-            chord_type = 'major'
-        
-        pattern = chord_patterns[chord_type]
-        frequencies = []
-        
-        for interval in pattern:
-            note_index = (root_index + interval) % 12
-            note_name = self.NOTE_NAMES[note_index]
-            octave_adjust = (root_index + interval) // 12
-            freq = self.note_to_freq(note_name, octave + octave_adjust)
-            frequencies.append(freq)
-        
-        return frequencies
+        return list(_chord_freqs(root, chord_type, octave, self.base_freq))
     
     def roman_to_chord(self, roman: str, key: str, scale: str = 'major') -> Tuple[str, str]:
         """
@@ -328,3 +285,66 @@ class MusicTheory:
         
         min_bpm, max_bpm = bpm_ranges.get(genre.lower(), (120, 130))
         return random.randint(min_bpm, max_bpm)
+
+
+def _note_freq(note: str, octave: int, base_freq: float) -> float:
+    """Frequency of a note, relative to base_freq at A4"""
+    if note not in MusicTheory.NOTE_NAMES:
+        raise ValueError(f"Invalid note: {note}")
+    
+    # Calculate semitones from A4
+    note_index = MusicTheory.NOTE_NAMES.index(note)
+    a_index = MusicTheory.NOTE_NAMES.index('A')
+    
+    # Semitones from A4
+    semitones = (octave - 4) * 12 + (note_index - a_index)
+    
+    # Calculate frequency
+    return base_freq * (2 ** (semitones / 12))
+
+
+@functools.lru_cache(maxsize=256)
+def _scale_notes(root: str, scale_type: str, octave: int,
+                 base_freq: float) -> Tuple[Tuple[str, float], ...]:
+    """Scale notes, computed once per (root, scale_type, octave, base_freq)"""
+    if scale_type not in MusicTheory.SCALES:
+        raise ValueError(f"Unknown scale type: {scale_type}")
+    
+    root_index = MusicTheory.NOTE_NAMES.index(root)
+    pattern = MusicTheory.SCALES[scale_type]
+    
+    notes = []
+    for interval in pattern:
+        note_index = (root_index + interval) % 12
+        note_name = MusicTheory.NOTE_NAMES[note_index]
+        
+        # Calculate octave adjustment
+        octave_adjust = (root_index + interval) // 12
+        note_octave = octave + octave_adjust
+        
+        freq = _note_freq(note_name, note_octave, base_freq)
+        notes.append((note_name, freq))
+    
+    return tuple(notes)
+
+
+@functools.lru_cache(maxsize=256)
+def _chord_freqs(root: str, chord_type: str, octave: int,
+                 base_freq: float) -> Tuple[float, ...]:
+    """Chord frequencies, computed once per (root, chord_type, octave, base_freq)"""
+    root_index = MusicTheory.NOTE_NAMES.index(root)
+    
+    if chord_type not in MusicTheory.CHORD_PATTERNS:
+        chord_type = 'major'
+    
+    pattern = MusicTheory.CHORD_PATTERNS[chord_type]
+    frequencies = []
+    
+    for interval in pattern:
+        note_index = (root_index + interval) % 12
+        note_name = MusicTheory.NOTE_NAMES[note_index]
+        octave_adjust = (root_index + interval) // 12
+        freq = _note_freq(note_name, octave + octave_adjust, base_freq)
+        frequencies.append(freq)
+    
+    return tuple(frequencies)
@@ -16,6 +16,43 @@ except ImportError:
     PROFESSIONAL_MODE = False
     print("⚠ Professional sounds not available, using standard synthesis")
 
+# JIT-compiled oscillators
+try:
+    from numba import njit, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # Compiled eagerly for the one signature the voices call it with, so the
+    # machine code is built (or loaded from Numba's on-disk cache) at import
+    # rather than by whichever stem thread plays the first note
+    _PARTIALS = types.Array(types.float64, 1, 'C')
+    
+    @njit(types.Array(types.float64, 1, 'C')(_PARTIALS, _PARTIALS, _PARTIALS, _PARTIALS,
+                                             types.int64, types.float64),
+          cache=True, nogil=True, fastmath=True)
+    def _additive_synth(freqs, amps, phases, decays, n_samples, dt):
+        """
+        Sum amps[k] * sin(2*pi*freqs[k]*t + phases[k]) * exp(-decays[k]*t)
+        over every partial in one pass, with t = i * dt
+        """
+        out = np.zeros(n_samples)
+        for k in range(freqs.shape[0]):
+            # Rotate a decaying phasor one sample at a time instead of
+            # calling sin and exp per sample
+            w = 2 * np.pi * freqs[k] * dt
+            r = np.exp(-decays[k] * dt)
+            c = r * np.cos(w)
+            s = r * np.sin(w)
+            x = amps[k] * np.cos(phases[k])
+            y = amps[k] * np.sin(phases[k])
+            for i in range(n_samples):
+                out[i] += y
+                x, y = x * c - y * s, x * s + y * c
+        return out
+
 
 class SoundGenerator:
     """Generate synthesized sounds and drum samples with premium quality"""
@@ -315,21 +352,35 @@ class SoundGenerator:
         Returns:
             Bass AudioSegment
         """
+        duration_ms = int(duration * 1000)
+        samples = int(self.sample_rate * duration_ms / 1000)
+        n = np.arange(samples)
+        
         # Use sawtooth wave for rich bass sound
-        generator = Sawtooth(frequency)
-        audio = generator.to_audio_segment(duration=int(duration * 1000))
+        cycle = self.sample_rate / frequency
+        bass = 2 * (n % cycle) / cycle - 1.0
         
         # Add sub harmonic
-        sub = Sine(frequency / 2).to_audio_segment(duration=int(duration * 1000))
-        audio = audio.overlay(sub - 6)  # Sub at -6dB
+        sub = np.sin(np.pi * frequency / self.sample_rate * n)
+        bass += sub * 10 ** (-6 / 20)  # Sub at -6dB
         
         # Apply ADSR envelope
-        attack = int(duration * 1000 * 0.05)  # 5% attack
-        release = int(duration * 1000 * 0.2)   # 20% release
+        attack = int(self.sample_rate * int(duration_ms * 0.05) / 1000)  # 5% attack
+        release = int(self.sample_rate * int(duration_ms * 0.2) / 1000)  # 20% release
+        if attack:
+            bass[:attack] *= np.linspace(0, 1, attack, endpoint=False)
+        if release:
+            bass[-release:] *= np.linspace(1, 0, release, endpoint=False)
         
-        audio = audio.fade_in(attack).fade_out(release)
+        # Saturate the summed peaks at full scale
+        bass = np.clip(bass * 32767, -32768, 32767).astype(np.int16)
         
-        return audio
+        return AudioSegment(
+            bass.tobytes(),
+            frame_rate=self.sample_rate,
+            sample_width=2,
+            channels=1
+        )
     
     def generate_synth(self, duration: float = 1.0, frequency: int = 440, waveform: str = "sine") -> AudioSegment:
         """
@@ -474,10 +525,14 @@ class SoundGenerator:
             (12.0, 0.011, 0.07),  # 12th
         ]
         
-        # Generate complex waveform with inharmonicity
-        signal = np.zeros(samples)
+        # Partial frequencies, amplitudes, phases and decay rates
+        n_harmonics = len(harmonics)
+        freqs = np.empty(n_harmonics)
+        amps = np.empty(n_harmonics)
+        phases = np.zeros(n_harmonics)
+        decays = np.empty(n_harmonics)
         
-        for harmonic_num, amplitude, inharmonicity in harmonics:
+        for k, (harmonic_num, amplitude, inharmonicity) in enumerate(harmonics):
             # Add slight random variation for realism
             freq_variation = 1.0
             amp_variation = 1.0
@@ -488,21 +543,24 @@ class SoundGenerator:
             
             # Inharmonic frequency (higher harmonics are progressively more sharp)
             freq_ratio = harmonic_num * (1 + inharmonicity * harmonic_num)
-            actual_freq = frequency * freq_ratio * freq_variation
+            freqs[k] = frequency * freq_ratio * freq_variation
+            amps[k] = amplitude * amp_variation
             
             # Phase with slight randomness for realism
-            phase_offset = random.uniform(0, 2 * np.pi) * variation if variation > 0 else 0
-            
-            # Generate harmonic
-            harmonic_signal = amplitude * amp_variation * np.sin(
-                2 * np.pi * actual_freq * t + phase_offset
-            )
+            if variation > 0:
+                phases[k] = random.uniform(0, 2 * np.pi) * variation
             
             # Each harmonic decays at different rate (higher = faster)
-            decay_rate = 2.0 + harmonic_num * 0.3
-            harmonic_env = np.exp(-decay_rate * t / duration)
-            
-            signal += harmonic_signal * harmonic_env
+            decays[k] = (2.0 + harmonic_num * 0.3) / duration
+        
+        # Generate complex waveform with inharmonicity
+        if NUMBA_AVAILABLE:
+            signal = _additive_synth(freqs, amps, phases, decays, samples,
+                                     t[1] if samples > 1 else 0.0)
+        else:
+            signal = np.zeros(samples)
+            for k in range(n_harmonics):
+                signal += amps[k] * np.sin(2 * np.pi * freqs[k] * t + phases[k]) * np.exp(-decays[k] * t)
         
         # Simplified ADSR Envelope (more robust, no buffer overflow)
         # Fast attack, medium decay, long release for piano
@@ -568,16 +626,21 @@ class SoundGenerator:
         
         # Multiple detuned oscillators for richness
         detune_amounts = [-7, -3, 0, 3, 7]  # cents
-        signal = np.zeros(samples)
+        freqs = frequency * 2 ** (np.array(detune_amounts) / 1200)
+        
+        # Mix of sine and sawtooth for warmth
+        if NUMBA_AVAILABLE:
+            n_osc = len(freqs)
+            signal = _additive_synth(freqs, np.full(n_osc, 0.6), np.zeros(n_osc),
+                                     np.zeros(n_osc), samples,
+                                     t[1] if samples > 1 else 0.0)
+        else:
+            signal = np.zeros(samples)
+            for freq_detune in freqs:
+                signal += 0.6 * np.sin(2 * np.pi * freq_detune * t)
         
-        for cents in detune_amounts:
-            freq_detune = frequency * (2 ** (cents / 1200))
-            
-            # Mix of sine and sawtooth for warmth
-            sine_wave = np.sin(2 * np.pi * freq_detune * t)
-            saw_wave = 2 * (t * freq_detune % 1) - 1
-            
-            signal += 0.6 * sine_wave + 0.4 * saw_wave
+        for freq_detune in freqs:
+            signal += 0.4 * (2 * (t * freq_detune % 1) - 1)
         
         signal /= len(detune_amounts)
         
@@ -0,0 +1,88 @@
+"""
+Tests for ContinuousGenerator's process-pool and joining paths and for
+InfiniteGenerator streaming
+"""
+
+import wave
+from unittest import mock
+
+from pydub import AudioSegment
+
+from src.composer import AutoComposer
+from src.continuous import ContinuousGenerator, InfiniteGenerator
+
+
+def _force_pool():
+    """Pretend there are several CPUs so _map_parallel uses its process pool"""
+    return mock.patch('src.continuous.os.cpu_count', return_value=2)
+
+
+def test_generate_variations_runs_in_process_pool():
+    generator = ContinuousGenerator()
+    with _force_pool():
+        variations = generator.generate_variations('lofi', 1, count=2, key='A')
+
+    assert len(variations) == 2
+    assert all(isinstance(track, AudioSegment) for track in variations)
+    assert all(len(track) > 0 for track in variations)
+    # Every worker is reseeded, so the variations differ
+    assert variations[0].raw_data != variations[1].raw_data
+
+
+def test_generate_mixtape_runs_in_process_pool():
+    generator = ContinuousGenerator()
+    with _force_pool():
+        mixtape = generator.generate_mixtape(['lofi', 'electro'], bars_per_genre=4,
+                                             transitions=False)
+
+    assert isinstance(mixtape, AudioSegment)
+    assert len(mixtape) > 0
+
+
+def test_generate_continuous_joins_sections_of_different_formats():
+    generator = ContinuousGenerator()
+    formats = {'intro': (96000, 1), 'verse': (44100, 2), 'outro': (96000, 1)}
+
+    def compose_section(genre, section_type, bars, key):
+        frame_rate, channels = formats[section_type]
+        return AudioSegment.silent(duration=100 * bars, frame_rate=frame_rate).set_channels(channels)
+
+    with mock.patch.object(generator.composer, 'compose_section', side_effect=compose_section):
+        track = generator.generate_continuous('lofi', 16, key='C')
+
+    # intro 4 + verse 8 + outro 4 bars, 100 ms each, all at the intro's format
+    assert (track.frame_rate, track.channels) == (96000, 1)
+    assert abs(len(track) - 1600) <= 1
+
+
+def _infinite_generator():
+    """Small lofi stream generator, one bar per section"""
+    return InfiniteGenerator(AutoComposer(premium=True), 'lofi', 1, 'C', 'medium')
+
+
+def test_stream_to_file_matches_generate_stream(tmp_path):
+    generator = _infinite_generator()
+    # Compose once and replay, so both paths see the same sections
+    sections = [generator.next_section() for _ in range(3)]
+    path = str(tmp_path / 'stream.wav')
+
+    with mock.patch.object(generator, 'next_section', side_effect=sections):
+        generator.stream_to_file(path, 3)
+    with mock.patch.object(generator, 'next_section', side_effect=sections):
+        stream = generator.generate_stream(3)
+
+    with wave.open(path, 'rb') as wf:
+        assert wf.getframerate() == stream.frame_rate
+        assert wf.getnchannels() == stream.channels
+        assert wf.getnframes() == stream.frame_count()
+        assert wf.readframes(wf.getnframes()) == stream.raw_data
+
+
+def test_stream_to_file_writes_empty_wav_for_no_bars(tmp_path):
+    generator = _infinite_generator()
+    path = str(tmp_path / 'empty.wav')
+    generator.stream_to_file(path, 0)
+
+    with wave.open(path, 'rb') as wf:
+        assert wf.getnframes() == 0
+        assert wf.getframerate() == generator.composer.output_rate